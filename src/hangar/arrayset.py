@@ -21,6 +21,7 @@ from .records.parsing import data_record_db_val_from_raw_val
 from .records.parsing import arrayset_record_count_range_key
 from .records.parsing import arrayset_record_schema_db_key_from_raw_key
 from .records.parsing import arrayset_record_schema_db_val_from_raw_val
+from .records.vcompat import set_repository_record_format
 
 
 CompatibleArray = NamedTuple(
@@ -103,12 +104,12 @@ class ArraysetDataReader(object):
         hashTxn = _TxnRegister.begin_reader_txn(hashenv)
         try:
             used_bes = set()
-            asetNamesSpec = RecordQuery(dataenv).arrayset_data_records(self._asetn)
-            for asetNames, dataSpec in asetNamesSpec:
-                hashKey = hash_data_db_key_from_raw_key(dataSpec.data_hash)
+            asetItems = RecordQuery(dataenv).arrayset_data_items(self._asetn)
+            for _, dataName, dataHash in asetItems:
+                hashKey = hash_data_db_key_from_raw_key(dataHash)
                 hash_ref = hashTxn.get(hashKey)
                 be_loc = backend_decoder(hash_ref)
-                self._sspecs[asetNames.data_name] = be_loc
+                self._sspecs[dataName] = be_loc
                 used_bes.add(be_loc.backend)
 
             if '50' in used_bes:
@@ -130,7 +131,7 @@ class ArraysetDataReader(object):
                 self._fs[be] = accessor(
                     repo_path=self._path,
                     schema_shape=self._schema_max_shape,
-                    schema_dtype=np.typeDict[self._schema_dtype_num])
+                    schema_dtype=np.sctypeDict[self._schema_dtype_num])
                 self._fs[be].open(self._mode)
 
     def __enter__(self):
@@ -193,7 +194,7 @@ class ArraysetDataReader(object):
                 \n    Schema Hash              : {self._default_schema_hash}\
                 \n    Variable Shape           : {bool(int(self._schema_variable))}\
                 \n    (max) Shape              : {self._schema_max_shape}\
-                \n    Datatype                 : {np.typeDict[self._schema_dtype_num]}\
+                \n    Datatype                 : {np.sctypeDict[self._schema_dtype_num]}\
                 \n    Named Samples            : {bool(self._samples_are_named)}\
                 \n    Access Mode              : {self._mode}\
                 \n    Number of Samples        : {self.__len__()}\
@@ -229,7 +230,7 @@ class ArraysetDataReader(object):
     def dtype(self) -> np.dtype:
         """Datatype of the arrayset schema. Read-only attribute.
         """
-        return np.typeDict[self._schema_dtype_num]
+        return np.sctypeDict[self._schema_dtype_num]
 
     @property
     def shape(self) -> Tuple[int]:
@@ -547,7 +548,7 @@ class ArraysetDataWriter(ArraysetDataReader):
         if not isinstance(data, np.ndarray):
             reason = f'`data` argument type: {type(data)} != `np.ndarray`'
         elif data.dtype.num != self._schema_dtype_num:
-            reason = f'dtype: {data.dtype} != aset: {np.typeDict[self._schema_dtype_num]}.'
+            reason = f'dtype: {data.dtype} != aset: {np.sctypeDict[self._schema_dtype_num]}.'
         elif not data.flags.c_contiguous:
             reason = f'`data` must be "C" contiguous array.'
 
@@ -745,7 +746,8 @@ class Arraysets(object):
                  arraysets: Mapping[str, Union[ArraysetDataReader, ArraysetDataWriter]],
                  hashenv: Optional[lmdb.Environment] = None,
                  dataenv: Optional[lmdb.Environment] = None,
-                 stagehashenv: Optional[lmdb.Environment] = None):
+                 stagehashenv: Optional[lmdb.Environment] = None,
+                 branchenv: Optional[lmdb.Environment] = None):
         """Developer documentation for init method.
 
         .. warning::
@@ -771,6 +773,9 @@ class Arraysets(object):
             cmtrefenv for read-only checkouts.
         stagehashenv : Optional[lmdb.Environment]
             environment handle for newly added staged data hash records.
+        branchenv : Optional[lmdb.Environment]
+            environment handle for the branch records, where the repository
+            record format is marked before a schema is first written.
         """
         self._mode = mode
         self._repo_pth = repo_pth
@@ -782,6 +787,7 @@ class Arraysets(object):
             self._hashenv = hashenv
             self._dataenv = dataenv
             self._stagehashenv = stagehashenv
+            self._branchenv = branchenv
 
         self.__setup()
 
@@ -1212,6 +1218,7 @@ class Arraysets(object):
 
         # -------- set vals in lmdb only after schema is sure to exist --------
 
+        set_repository_record_format(self._branchenv)
         dataTxn = TxnRegister().begin_writer_txn(self._dataenv)
         hashTxn = TxnRegister().begin_writer_txn(self._hashenv)
         hashSchemaKey = hash_schema_db_key_from_raw_key(schema_hash)
@@ -1286,7 +1293,7 @@ class Arraysets(object):
 # ------------------------ Class Factory Functions ------------------------------
 
     @classmethod
-    def _from_staging_area(cls, repo_pth, hashenv, stageenv, stagehashenv):
+    def _from_staging_area(cls, repo_pth, hashenv, stageenv, stagehashenv, branchenv):
         """Class method factory to checkout :class:`Arraysets` in write-enabled mode
 
         This is not a user facing operation, and should never be manually called
@@ -1304,6 +1311,8 @@ class Arraysets(object):
             environment where staging records (dataenv) are opened in write mode.
         stagehashenv: lmdb.Environment
             environment where the staged hash records are stored in write mode
+        branchenv: lmdb.Environment
+            environment where the branch records are stored in write mode
 
         Returns
         -------
@@ -1331,7 +1340,7 @@ class Arraysets(object):
                 mode='a',
                 default_schema_backend=schemaSpec.schema_default_backend)
 
-        return cls('a', repo_pth, arraysets, hashenv, stageenv, stagehashenv)
+        return cls('a', repo_pth, arraysets, hashenv, stageenv, stagehashenv, branchenv)
 
     @classmethod
     def _from_commit(cls, repo_pth, hashenv, cmtrefenv):
@@ -729,7 +729,8 @@ class WriterCheckout(object):
             repo_pth=self._repo_path,
             hashenv=self._hashenv,
             stageenv=self._stageenv,
-            stagehashenv=self._stagehashenv)
+            stagehashenv=self._stagehashenv,
+            branchenv=self._branchenv)
         self._differ = WriterUserDiff(
             stageenv=self._stageenv,
             refenv=self._refenv,
@@ -1244,7 +1245,8 @@ class WriterCheckout(object):
             repo_pth=self._repo_path,
             hashenv=self._hashenv,
             stageenv=self._stageenv,
-            stagehashenv=self._stagehashenv)
+            stagehashenv=self._stagehashenv,
+            branchenv=self._branchenv)
         self._differ = WriterUserDiff(
             stageenv=self._stageenv,
             refenv=self._refenv,
@@ -1361,7 +1363,8 @@ class WriterCheckout(object):
             repo_pth=self._repo_path,
             hashenv=self._hashenv,
             stageenv=self._stageenv,
-            stagehashenv=self._stagehashenv)
+            stagehashenv=self._stagehashenv,
+            branchenv=self._branchenv)
         self._differ = WriterUserDiff(
             stageenv=self._stageenv,
             refenv=self._refenv,
@@ -20,9 +20,29 @@ K_SCHEMA = f's{SEP_KEY}'
 K_HASH = f'h{SEP_KEY}'
 K_WLOCK = f'writerlock{SEP_KEY}'
 K_VERSION = 'software_version'
+K_RECORD_FORMAT = 'record_format_version'
 
 WLOCK_SENTINAL = 'LOCK_AVAILABLE'
 
+# pre-encoded versions of the parsing constants for building lmdb keys
+
+SEP_KEY_B = SEP_KEY.encode()
+SEP_CMT_B = SEP_CMT.encode()
+
+K_INT_B = K_INT.encode()
+K_BRANCH_B = K_BRANCH.encode()
+K_HEAD_B = K_HEAD.encode()
+K_REMOTES_B = K_REMOTES.encode()
+K_STGARR_B = K_STGARR.encode()
+K_STGMETA_B = K_STGMETA.encode()
+K_SCHEMA_B = K_SCHEMA.encode()
+K_HASH_B = K_HASH.encode()
+K_WLOCK_B = K_WLOCK.encode()
+K_VERSION_B = K_VERSION.encode()
+K_RECORD_FORMAT_B = K_RECORD_FORMAT.encode()
+
+WLOCK_SENTINAL_B = WLOCK_SENTINAL.encode()
+
 # directory names
 
 DIR_HANGAR = '.hangar'
@@ -37,6 +57,14 @@ DIR_DATA_REMOTE = 'remote_data'
 CONFIG_USER_NAME = 'config_user.yml'
 CONFIG_SERVER_NAME = 'config_server.yml'
 
+# remote rpc metadata key carrying the record format version the client reads
+HEADER_CLIENT_RECORD_FORMAT = 'hangar-client-record-format'
+
+# largest grpc message the server and client send or accept. streamed payloads
+# are chunked well below this, but single messages carrying digest lists /
+# records for large commits can exceed grpc's 4MB default.
+GRPC_MAX_MESSAGE_NBYTES = 64 << 20
+
 # LMDB database names and settings.
 
 LMDB_SETTINGS = {
@@ -44,7 +72,16 @@ LMDB_SETTINGS = {
     'meminit': False,
     'subdir': False,
     'lock': False,
-    'max_spare_txns': 2,
+    'max_spare_txns': 16,
+    'readahead': False,
+}
+
+# settings for scratch databases (ie. unpacked commit refs) which are removed
+# once closed, so there is no need to pay for durability on each commit.
+LMDB_TMP_SETTINGS = {
+    **LMDB_SETTINGS,
+    'sync': False,
+    'writemap': True,
 }
 
 LMDB_REF_NAME = 'ref.lmdb'
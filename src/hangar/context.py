@@ -230,6 +230,12 @@ class Environments(object):
             raise RuntimeError(msg)
 
         self._open_environments()
+        repo_fmt = vcompat.get_repository_record_format_spec(self.branchenv)
+        if not vcompat.can_read_records_written_by(vcompat.current_record_format, repo_fmt):
+            self._close_environments()
+            msg = f'repository records written in format version: {repo_fmt} can not be '\
+                  f'read by the current Hangar software version: {curr_ver}'
+            raise RuntimeError(msg)
         return True
 
     def _init_repo(self,
@@ -327,13 +333,13 @@ class Environments(object):
         if platform.system() != 'Windows':
             with tempfile.TemporaryDirectory() as tempD:
                 tmpDF = os.path.join(tempD, f'{commit_hash}.lmdb')
-                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
                 commiting.unpack_commit_ref(self.refenv, tmpDB, commit_hash)
                 self.cmtenv[commit_hash] = tmpDB
         else:
             tempD = tempfile.mkdtemp()
             tmpDF = os.path.join(tempD, f'{commit_hash}.lmdb')
-            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
             commiting.unpack_commit_ref(self.refenv, tmpDB, commit_hash)
             self.cmtenv[commit_hash] = tmpDB
 
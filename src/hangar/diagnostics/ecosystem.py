@@ -97,6 +97,13 @@ def get_optional_info() -> Dict[str, Union[str, bool]]:
         tensorflowVersion = False
     res['tensorflow'] = tensorflowVersion
 
+    try:
+        import orjson
+        orjsonVersion = orjson.__version__
+    except ImportError:
+        orjsonVersion = False
+    res['orjson'] = orjsonVersion
+
     return res
 
 
@@ -8,7 +8,7 @@ from contextlib import contextmanager
 import lmdb
 import yaml
 
-from . import heads, parsing
+from . import heads, parsing, vcompat
 from .. import constants as c
 from ..context import TxnRegister
 from .parsing import DigestAndBytes
@@ -338,7 +338,7 @@ def tmp_cmt_env(refenv: lmdb.Environment, commit_hash: str):
     tempD = tempfile.mkdtemp()
     try:
         tmpDF = os.path.join(tempD, 'test.lmdb')
-        tmpDB = lmdb.open(path=tmpDF, sync=False, writemap=True, **c.LMDB_SETTINGS)
+        tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
         unpack_commit_ref(refenv, tmpDB, commit_hash)
         yield tmpDB
     finally:
@@ -515,6 +515,7 @@ def commit_records(message, branchenv, stageenv, refenv, repo_path,
     commitParentKey = parsing.commit_parent_db_key_from_raw_key(commit_hash)
     commitRefKey = parsing.commit_ref_db_key_from_raw_key(commit_hash)
 
+    vcompat.set_repository_record_format(branchenv)
     reftxn = TxnRegister().begin_writer_txn(refenv)
     try:
         reftxn.put(commitSpecKey, cmtSpec.raw, overwrite=False)
@@ -21,7 +21,7 @@ class HashQuery(object):
         list of tuples of bytes
             list type stack of tuples with each db_key, db_val pair
         """
-        startHashRangeKey = f'{c.K_HASH}'.encode()
+        startHashRangeKey = c.K_HASH_B
         try:
             hashtxn = TxnRegister().begin_reader_txn(self._hashenv)
             with hashtxn.cursor() as cursor:
@@ -45,7 +45,7 @@ class HashQuery(object):
         list of tuples of bytes
             list type stack of tuples with each db_key, db_val pair
         """
-        startSchemaRangeKey = f'{c.K_SCHEMA}'.encode()
+        startSchemaRangeKey = c.K_SCHEMA_B
         try:
             hashtxn = TxnRegister().begin_reader_txn(self._hashenv)
             with hashtxn.cursor() as cursor:
@@ -481,7 +481,7 @@ def get_branch_names(branchenv):
     list of str
         list of branch names active in the repository.
     """
-    branchStartKey = parsing.c.K_BRANCH.encode()  # TODO: This is odd, why??
+    branchStartKey = parsing.c.K_BRANCH_B  # TODO: This is odd, why??
     branchNames = []
     branchTxn = TxnRegister().begin_reader_txn(branchenv)
     try:
@@ -645,7 +645,7 @@ def get_remote_names(branchenv):
     list of str
         list of remote names active in the repository.
     """
-    remoteStartKey = parsing.c.K_REMOTES.encode()  # TODO: This is odd, why??
+    remoteStartKey = parsing.c.K_REMOTES_B  # TODO: This is odd, why??
     remoteNames = []
     branchTxn = TxnRegister().begin_reader_txn(branchenv)
     try:
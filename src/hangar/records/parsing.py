@@ -1,31 +1,121 @@
 import json
-from itertools import cycle
-from time import sleep
-from time import perf_counter
+import sys
+import threading
+from functools import lru_cache
 from random import randint
-from typing import Union, NamedTuple, Tuple, Iterable
+from typing import Union, NamedTuple, Tuple, Iterable, List
 from hashlib import blake2b
 
 import blosc
+import msgpack
 
 from .. import constants as c
 
-cycle_list = [str(c).rjust(5, '0') for c in range(99_999)]
-NAME_CYCLER = cycle(cycle_list)
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: no cover  (python < 3.7)
+    from time import perf_counter
+
+    def perf_counter_ns() -> int:
+        return int(perf_counter() * 1_000_000_000)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Record values whose encoding changed in hangar 0.4.0 start with a two byte
+# tag: 0xc1 (never emitted by msgpack, and unable to start a json document or a
+# blosc frame, which is how hangar < 0.4.0 wrote them) followed by the format
+# revision of the payload which comes after it.
+_FORMAT_TAG = b'\xc1'
+_FORMAT_V1 = _FORMAT_TAG + b'\x01'
+_LEN_FORMAT_TAG = len(_FORMAT_V1)
+
+
+def _is_truncated_record(db_val: bytes) -> bool:
+    """an empty value, or a format tag missing its revision byte"""
+    return (not db_val) or (db_val == _FORMAT_TAG)
+
+
+def _corrupt_record_error(db_val: bytes) -> ValueError:
+    return ValueError(
+        f'record value {db_val!r} is empty or truncated; the record is corrupt.')
+
+
+def _unknown_format_error(db_val: bytes) -> ValueError:
+    revision = db_val[1:_LEN_FORMAT_TAG].hex()
+    return ValueError(
+        f'record value format revision {revision} is not known to this version of '
+        f'hangar; it was written by a newer release. Please upgrade hangar.')
+
+
+NAME_COUNTER = 0
+NAME_COUNTER_MAX = 99_999
+NAME_COUNTER_LOCK = threading.Lock()
 RANDOM_NAME_SEED = str(randint(0, 999_999_999)).rjust(0, '0')
-perf_counter()  # call to init monotonic start point
+perf_counter_ns()  # call to init monotonic start point
 
+# byte lengths of the key prefixes, used to strip them from db keys by slicing
+_LEN_K_INT = len(c.K_INT_B)
+_LEN_K_BRANCH = len(c.K_BRANCH_B)
+_LEN_K_REMOTES = len(c.K_REMOTES_B)
+_LEN_K_STGARR = len(c.K_STGARR_B)
+_LEN_K_STGMETA = len(c.K_STGMETA_B)
+_LEN_K_SCHEMA = len(c.K_SCHEMA_B)
+_LEN_K_HASH = len(c.K_HASH_B)
+
+
+@lru_cache(maxsize=256)
+def _decode_name(name: bytes) -> str:
+    """decode (and intern) arrayset / branch names repeated across many keys"""
+    return sys.intern(name.decode())
+
+
+def _reserve_name_counter(n: int) -> int:
+    global NAME_COUNTER
+    with NAME_COUNTER_LOCK:
+        start = NAME_COUNTER
+        NAME_COUNTER = (start + n) % NAME_COUNTER_MAX
+    return start
 
-def generate_sample_name() -> str:
-    ncycle = next(NAME_CYCLER)
-    if ncycle == '00000':
-        sleep(0.001)
 
-    sec, subsec = str(perf_counter()).split('.')
-    name = f'{RANDOM_NAME_SEED}{sec.rjust(6, "0")}{subsec.ljust(9, "0")}{ncycle}'
+def generate_sample_name() -> str:
+    ncount = _reserve_name_counter(1)
+    sec, subsec = divmod(perf_counter_ns(), 1_000_000_000)
+    name = f'{RANDOM_NAME_SEED}{sec:06d}{subsec:09d}{ncount:05d}'
     return name
 
 
+def generate_sample_names(n: int) -> List[str]:
+    """Generate ``n`` unique sample names in a single call.
+
+    Equivalent to calling :func:`generate_sample_name` ``n`` times, but a
+    contiguous block of counter values is reserved at once, and the clock is
+    only read once per ``NAME_COUNTER_MAX`` names. Safe to call from multiple
+    threads.
+
+    Parameters
+    ----------
+    n : int
+        number of names to generate
+
+    Returns
+    -------
+    List[str]
+        generated sample names
+    """
+    start = _reserve_name_counter(n)
+    names = []
+    for blockStart in range(0, n, NAME_COUNTER_MAX):
+        sec, subsec = divmod(perf_counter_ns(), 1_000_000_000)
+        prefix = f'{RANDOM_NAME_SEED}{sec:06d}{subsec:09d}'
+        blockStop = min(n, blockStart + NAME_COUNTER_MAX)
+        names.extend([f'{prefix}{(start + i) % NAME_COUNTER_MAX:05d}'
+                      for i in range(blockStart, blockStop)])
+    return names
+
+
 """
 Parsing functions used to deal with repository state The parsers defined in this
 section handle repo/branch records.
@@ -91,8 +181,18 @@ def repo_version_db_key() -> bytes:
     bytes
         db formatted key to use to get/set the repository software version.
     """
-    db_key = c.K_VERSION.encode()
-    return db_key
+    return c.K_VERSION_B
+
+
+def repo_record_format_db_key() -> bytes:
+    """The db formated key which the repository record format version is stored at
+
+    Returns
+    -------
+    bytes
+        db formatted key to use to get/set the repository record format version.
+    """
+    return c.K_RECORD_FORMAT_B
 
 
 # ------------------------ raw -> db --------------------------------
@@ -154,22 +254,21 @@ def repo_head_db_key() -> bytes:
     bytestring
         lmdb key to query while looking up the head staging branch name
     """
-    db_key = c.K_HEAD.encode()
-    return db_key
+    return c.K_HEAD_B
 
 
 # --------------------- raw -> db -----------------------------------
 
 
 def repo_head_db_val_from_raw_val(branch_name: str) -> bytes:
-    db_val = f'{c.K_BRANCH}{branch_name}'.encode()
+    db_val = c.K_BRANCH_B + str(branch_name).encode()
     return db_val
 
 
 # --------------------- db -> raw -----------------------------------
 
 def repo_head_raw_val_from_db_val(db_val: str) -> bytes:
-    raw_val = db_val.decode().replace(c.K_BRANCH, '', 1)
+    raw_val = db_val[_LEN_K_BRANCH:].decode()
     return raw_val
 
 
@@ -182,7 +281,7 @@ Methods working with branch names / head commit values
 
 
 def repo_branch_head_db_key_from_raw_key(branch_name: str) -> bytes:
-    db_key = f'{c.K_BRANCH}{branch_name}'.encode()
+    db_key = c.K_BRANCH_B + str(branch_name).encode()
     return db_key
 
 
@@ -195,8 +294,7 @@ def repo_branch_head_db_val_from_raw_val(commit_hash: str) -> bytes:
 
 
 def repo_branch_head_raw_key_from_db_key(db_key: bytes) -> str:
-    key_str = db_key.decode()
-    branch_name = key_str.replace(c.K_BRANCH, '', 1)
+    branch_name = _decode_name(db_key[_LEN_K_BRANCH:])
     return branch_name
 
 
@@ -217,13 +315,11 @@ Methods working with writer lock key/values
 
 
 def repo_writer_lock_db_key() -> bytes:
-    db_key = f'{c.K_WLOCK}'.encode()
-    return db_key
+    return c.K_WLOCK_B
 
 
 def repo_writer_lock_sentinal_db_val() -> bytes:
-    db_val = f'{c.WLOCK_SENTINAL}'.encode()
-    return db_val
+    return c.WLOCK_SENTINAL_B
 
 
 def repo_writer_lock_force_release_sentinal() -> str:
@@ -307,10 +403,12 @@ def data_record_raw_key_from_db_key(db_key: bytes) -> RawDataRecordKey:
     RawDataRecordKey
         Tuple containing the record aset_name, data_name
     """
-    key = db_key.decode()
-    aset_name, data_name = key.replace(c.K_STGARR, '', 1).split(c.SEP_KEY)
-    if data_name.startswith(c.K_INT):
-        data_name = int(data_name.lstrip(c.K_INT))
+    aset_name, _, data_name = db_key[_LEN_K_STGARR:].partition(c.SEP_KEY_B)
+    aset_name = _decode_name(aset_name)
+    if data_name.startswith(c.K_INT_B):
+        data_name = int(data_name[_LEN_K_INT:])
+    else:
+        data_name = data_name.decode()
     return RawDataRecordKey(aset_name, data_name)
 
 
@@ -331,6 +429,36 @@ def data_record_raw_val_from_db_val(db_val: bytes) -> RawDataRecordVal:
     return RawDataRecordVal(data_hash)
 
 
+def iter_data_records(db_items: Iterable[Tuple[bytes, bytes]]
+                      ) -> Iterable[Tuple[str, Union[str, int], bytes]]:
+    """Convert lmdb data record key/value pairs into plain python tuples.
+
+    Batch equivalent of :func:`data_record_raw_key_from_db_key` and
+    :func:`data_record_raw_val_from_db_val` for callers which do not need the
+    named tuple fields; avoids allocating two named tuples per record.
+
+    Parameters
+    ----------
+    db_items : Iterable[Tuple[bytes, bytes]]
+        full lmdb data record keys and values, ie. ``dict.items()`` of a range
+        of data records.
+
+    Yields
+    ------
+    Tuple[str, Union[str, int], bytes]
+        aset_name, data_name, and data_hash of each record. The data_hash is
+        left encoded, as it is usually only used to build a hash db key (the
+        ``hash_*_db_key_from_raw_key`` functions accept it as is).
+    """
+    for db_key, db_val in db_items:
+        aset_name, _, data_name = db_key[_LEN_K_STGARR:].partition(c.SEP_KEY_B)
+        if data_name.startswith(c.K_INT_B):
+            data_name = int(data_name[_LEN_K_INT:])
+        else:
+            data_name = data_name.decode()
+        yield _decode_name(aset_name), data_name, db_val
+
+
 # -------------------- raw (python) -> db -----------------------------
 
 
@@ -394,7 +522,7 @@ def arrayset_record_schema_db_key_from_raw_key(aset_name):
     bytestring
         the db_key which can be used to query the schema
     """
-    db_schema_key = f'{c.K_SCHEMA}{aset_name}'.encode()
+    db_schema_key = c.K_SCHEMA_B + aset_name.encode()
     return db_schema_key
 
 
@@ -428,30 +556,45 @@ def arrayset_record_schema_db_val_from_raw_val(schema_hash,
     -------
     bytestring
         Bytes encoded representation of the schema.
+
+    Notes
+    -----
+    Stored as a json array (field order of ``RawArraysetSchemaVal``) behind
+    the record format tag. Schemas written by hangar < 0.4.0 are keyed json
+    objects; both are read by :func:`arrayset_record_schema_raw_val_from_db_val`.
     """
-    schema_val = {
-        'schema_hash': schema_hash,
-        'schema_dtype': schema_dtype,
-        'schema_is_var': schema_is_var,
-        'schema_max_shape': schema_max_shape,
-        'schema_is_named': schema_is_named,
-        'schema_default_backend': schema_default_backend,
-    }
-    db_schema_val = json.dumps(schema_val, separators=(',', ':')).encode()
+    schema_val = (schema_hash, schema_dtype, schema_is_var,
+                  schema_max_shape, schema_is_named, schema_default_backend)
+    db_schema_val = _FORMAT_V1 + json.dumps(schema_val, separators=(',', ':')).encode()
     return db_schema_val
 
 
 # -------------- db schema -> raw schema -------------------------------
 
 def arrayset_record_schema_raw_key_from_db_key(db_key: bytes) -> str:
-    aset_name = db_key.decode().replace(c.K_SCHEMA, '', 1)
+    aset_name = _decode_name(db_key[_LEN_K_SCHEMA:])
     return aset_name
 
 
+@lru_cache(maxsize=256)
 def arrayset_record_schema_raw_val_from_db_val(db_val: bytes) -> RawArraysetSchemaVal:
-    schema_spec = json.loads(db_val)
-    schema_spec['schema_max_shape'] = tuple(schema_spec['schema_max_shape'])
-    raw_val = RawArraysetSchemaVal(**schema_spec)
+    """Convert a schema record value into a ``RawArraysetSchemaVal``.
+
+    Schema records are never modified once written, so results are memoized
+    on the (hashable) ``db_val`` bytes.
+    """
+    if _is_truncated_record(db_val):
+        raise _corrupt_record_error(db_val)
+    elif db_val[:_LEN_FORMAT_TAG] == _FORMAT_V1:
+        schema_spec = json_loads(db_val[_LEN_FORMAT_TAG:])
+    elif db_val[:1] == _FORMAT_TAG:
+        raise _unknown_format_error(db_val)
+    else:  # keyed json written by hangar < 0.4.0
+        schema_dict = json_loads(db_val)
+        schema_spec = [schema_dict[field] for field in RawArraysetSchemaVal._fields]
+    schema_hash, schema_dtype, schema_is_var, max_shape, is_named, backend = schema_spec
+    raw_val = RawArraysetSchemaVal(
+        schema_hash, schema_dtype, schema_is_var, tuple(max_shape), is_named, backend)
     return raw_val
 
 
@@ -487,8 +630,7 @@ def metadata_range_key() -> bytes:
     bytes
         db key to access the metadata count at
     """
-    db_key = c.K_STGMETA.encode()
-    return db_key
+    return c.K_STGMETA_B
 
 
 """
@@ -518,9 +660,10 @@ def metadata_record_raw_key_from_db_key(db_key: bytes) -> MetadataRecordKey:
     MetadataRecordKey
         the metadata name
     """
-    meta_name = db_key.decode().replace(c.K_STGMETA, '', 1)
-    if meta_name.startswith(c.K_INT):
-        meta_name = int(meta_name.lstrip(c.K_INT))
+    if db_key.startswith(c.K_INT_B, _LEN_K_STGMETA):
+        meta_name = int(db_key[_LEN_K_STGMETA + _LEN_K_INT:])
+    else:
+        meta_name = db_key[_LEN_K_STGMETA:].decode()
     return MetadataRecordKey(meta_name)
 
 
@@ -560,7 +703,7 @@ def metadata_record_db_key_from_raw_key(meta_name: Union[str, int]) -> bytes:
     if isinstance(meta_name, int):
         record_key = f'{c.K_STGMETA}{c.K_INT}{meta_name}'.encode()
     else:
-        record_key = f'{c.K_STGMETA}{meta_name}'.encode()
+        record_key = c.K_STGMETA_B + meta_name.encode()
     return record_key
 
 
@@ -608,31 +751,37 @@ Data Hash parsing functions used to convert db key/val to raw pyhon obj
 # -------------------- raw (python) -> db ----------------------------------------
 
 
-def hash_schema_db_key_from_raw_key(schema_hash: str) -> bytes:
-    key = f'{c.K_SCHEMA}{schema_hash}'
-    db_key = key.encode()
+def hash_schema_db_key_from_raw_key(schema_hash: Union[str, bytes]) -> bytes:
+    if isinstance(schema_hash, str):
+        schema_hash = schema_hash.encode()
+    db_key = c.K_SCHEMA_B + schema_hash
     return db_key
 
 
-def hash_data_db_key_from_raw_key(data_hash: str) -> bytes:
-    key = f'{c.K_HASH}{data_hash}'
-    db_key = key.encode()
+def hash_data_db_key_from_raw_key(data_hash: Union[str, bytes]) -> bytes:
+    if isinstance(data_hash, str):
+        data_hash = data_hash.encode()
+    db_key = c.K_HASH_B + data_hash
     return db_key
 
 
+def hash_data_db_keys_from_raw_keys(data_hashes: Iterable[str]) -> List[bytes]:
+    """batch form of :func:`hash_data_db_key_from_raw_key` for str digests
+    """
+    prefix = c.K_HASH_B
+    return [prefix + data_hash.encode() for data_hash in data_hashes]
+
+
 # ----------------------------- db -> raw (python) ----------------------------
 
 
 def hash_schema_raw_key_from_db_key(db_key: bytes) -> str:
-    raw_key = db_key.decode()
-    data_hash = raw_key.replace(c.K_SCHEMA, '', 1)
+    data_hash = db_key[_LEN_K_SCHEMA:].decode()
     return data_hash
 
 
 def hash_data_raw_key_from_db_key(db_key: bytes) -> str:
-    # may be uncesessary
-    raw_key = db_key.decode()
-    data_hash = raw_key.replace(c.K_HASH, '', 1)
+    data_hash = db_key[_LEN_K_HASH:].decode()
     return data_hash
 
 
@@ -644,8 +793,10 @@ Metadata/Label Hash parsing functions used to convert db key/val to raw pyhon ob
 # -------------------- raw (python) -> db ----------------------------------------
 
 
-def hash_meta_db_key_from_raw_key(meta_hash: str) -> bytes:
-    db_key = f'{c.K_HASH}{meta_hash}'.encode()
+def hash_meta_db_key_from_raw_key(meta_hash: Union[str, bytes]) -> bytes:
+    if isinstance(meta_hash, str):
+        meta_hash = meta_hash.encode()
+    db_key = c.K_HASH_B + meta_hash
     return db_key
 
 
@@ -658,10 +809,17 @@ def hash_meta_db_val_from_raw_val(meta_val: str) -> bytes:
 
 
 def hash_meta_raw_key_from_db_key(db_key: bytes) -> str:
-    data_hash = db_key.decode().replace(c.K_HASH, '', 1)
+    data_hash = db_key[_LEN_K_HASH:].decode()
     return data_hash
 
 
+def hash_meta_raw_keys_from_db_keys(db_keys: Iterable[bytes]) -> List[str]:
+    """batch form of :func:`hash_meta_raw_key_from_db_key`
+    """
+    start = _LEN_K_HASH
+    return [db_key[start:].decode() for db_key in db_keys]
+
+
 def hash_meta_raw_val_from_db_val(db_val: bytes) -> str:
     meta_val = db_val.decode()
     return meta_val
@@ -683,8 +841,7 @@ def remote_db_key_from_raw_key(remote_name: str) -> bytes:
     bytes
         db key allowing access to address value at the name of the remote
     """
-    raw_key = f'{c.K_REMOTES}{remote_name}'
-    db_key = raw_key.encode()
+    db_key = c.K_REMOTES_B + remote_name.encode()
     return db_key
 
 
@@ -701,8 +858,7 @@ def remote_raw_key_from_db_key(db_key: bytes) -> str:
     str
         name of the remote
     """
-    raw_key = db_key.decode()
-    remote_name = raw_key[len(c.K_REMOTES):]
+    remote_name = db_key[_LEN_K_REMOTES:].decode()
     return remote_name
 
 
@@ -873,19 +1029,10 @@ def commit_parent_raw_val_from_db_val(db_val: bytes) -> DigestAndAncestorSpec:
     """
     parentValDigest = _hash_func(db_val)
 
-    commit_str = db_val.decode()
-    commit_ancestors = commit_str.split(c.SEP_CMT)
-    if len(commit_ancestors) == 1:
-        is_merge_commit = False
-        master_ancestor = commit_ancestors[0]
-        dev_ancestor = ''
-    else:
-        is_merge_commit = True
-        master_ancestor = commit_ancestors[0]
-        dev_ancestor = commit_ancestors[1]
-
+    master_ancestor, sep, dev_ancestor = db_val.decode().partition(c.SEP_CMT)
+    is_merge_commit = bool(sep)
     ancestorSpec = CommitAncestorSpec(is_merge_commit, master_ancestor, dev_ancestor)
-    res = DigestAndAncestorSpec(digest=parentValDigest, ancestor_spec=ancestorSpec)
+    res = DigestAndAncestorSpec(parentValDigest, ancestorSpec)
     return res
 
 
@@ -949,7 +1096,9 @@ def commit_ref_db_val_from_raw_val(db_kvs: Iterable[Tuple[bytes, bytes]]) -> Dig
     refDigest = _commit_ref_joined_kv_digest(joined)
 
     pck = c.CMT_REC_JOIN_KEY.join(joined)
-    raw = blosc.compress(pck, typesize=1, clevel=9, shuffle=blosc.SHUFFLE, cname='zlib')
+    # the compressed size is bound by the (incompressible) hex digests in each
+    # record rather than the repeated key prefixes, which zstd already removes.
+    raw = blosc.compress(pck, typesize=1, clevel=3, shuffle=blosc.NOSHUFFLE, cname='zstd')
     res = DigestAndBytes(digest=refDigest, raw=raw)
     return res
 
@@ -1015,28 +1164,43 @@ def commit_spec_db_val_from_raw_val(commit_time: float, commit_message: str,
     Returns
     -------
     DigestAndBytes
-        Two tuple containing ``digest`` and ``raw`` compressed binary encoded
+        Two tuple containing ``digest`` and ``raw`` binary encoded
         serialization of commit spec
+
+    Notes
+    -----
+    The spec is only a few hundred bytes, so it is stored as an uncompressed
+    msgpack array (field order of ``CommitUserSpec``) behind the record format
+    tag. Specs written by hangar < 0.4.0 are blosc compressed keyed json; both
+    are read by :func:`commit_spec_raw_val_from_db_val`.
     """
-    spec_dict = {
-        'commit_time': commit_time,
-        'commit_message': commit_message,
-        'commit_user': commit_user,
-        'commit_email': commit_email,
-    }
-
-    db_spec_val = json.dumps(spec_dict, separators=(',', ':')).encode()
+    spec_val = (commit_time, commit_message, commit_user, commit_email)
+    db_spec_val = _FORMAT_V1 + msgpack.packb(spec_val, use_bin_type=True)
     digest = _hash_func(db_spec_val)
-    comp_raw = blosc.compress(
-        db_spec_val, typesize=8, clevel=9, shuffle=blosc.SHUFFLE, cname='zlib')
-    res = DigestAndBytes(digest=digest, raw=comp_raw)
+    res = DigestAndBytes(digest=digest, raw=db_spec_val)
     return res
 
 
+@lru_cache(maxsize=1024)
 def commit_spec_raw_val_from_db_val(db_val: bytes) -> DigestAndUserSpec:
-    uncompressed_db_val = blosc.decompress(db_val)
-    digest = _hash_func(uncompressed_db_val)
-    commit_spec = json.loads(uncompressed_db_val)
-    user_spec = CommitUserSpec(**commit_spec)
-    res = DigestAndUserSpec(digest=digest, user_spec=user_spec)
+    """Convert a commit spec db value into its digest and ``CommitUserSpec``.
+
+    Commits are immutable, so results are memoized on the (hashable) ``db_val``
+    bytes; any modification of the stored bytes is a cache miss and is parsed
+    (and digested) again.
+    """
+    if _is_truncated_record(db_val):
+        raise _corrupt_record_error(db_val)
+    elif db_val[:_LEN_FORMAT_TAG] == _FORMAT_V1:
+        digest = _hash_func(db_val)
+        commit_spec = msgpack.unpackb(db_val[_LEN_FORMAT_TAG:], raw=False)
+    elif db_val[:1] == _FORMAT_TAG:
+        raise _unknown_format_error(db_val)
+    else:  # blosc compressed keyed json written by hangar < 0.4.0
+        uncomp_db_val = blosc.decompress(db_val)
+        digest = _hash_func(uncomp_db_val)
+        spec_dict = json_loads(uncomp_db_val)
+        commit_spec = [spec_dict[field] for field in CommitUserSpec._fields]
+    user_spec = CommitUserSpec(*commit_spec)
+    res = DigestAndUserSpec(digest, user_spec)
     return res
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Tuple, List, Iterator, Iterable, Set, Dict
+from typing import Tuple, List, Iterator, Iterable, Set, Dict, Union
 
 import lmdb
 
@@ -77,7 +77,7 @@ class RecordQuery(object):
             dictionary of db schema keys and db_values
         """
         schemaRecords = {}
-        startSchemaRangeKey = f'{c.K_SCHEMA}'.encode()
+        startSchemaRangeKey = c.K_SCHEMA_B
         try:
             datatxn = TxnRegister().begin_reader_txn(self._dataenv)
             with datatxn.cursor() as cursor:
@@ -201,6 +201,26 @@ class RecordQuery(object):
             recs = zip(data_rec_keys, data_rec_vals)
         return recs
 
+    def arrayset_data_items(self, arrayset_name: str
+                            ) -> Iterable[Tuple[str, Union[str, int], bytes]]:
+        """Returns plain tuples of the data records for a specific arrayset.
+
+        Identical contents to `arrayset_data_records`, but without building the
+        record key/value named tuples for each sample.
+
+        Parameters
+        ----------
+        arrayset_name : str
+            name of the arrayset to pull records for
+
+        Yields
+        ------
+        Tuple[str, Union[str, int], bytes]
+            generator of aset_name, data_name, encoded data_hash for each record
+        """
+        recs = self._traverse_arrayset_data_records(arrayset_name)
+        return parsing.iter_data_records(recs.items())
+
     def arrayset_data_names(self, arrayset_name):
         """Find all data names contained within a arrayset.
 
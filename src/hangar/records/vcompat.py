@@ -152,17 +152,122 @@ def startup_check_repo_version(repo_path: os.PathLike) -> VersionSpec:
     return spec
 
 
+"""
+Repository record format markers
+--------------------------------
+
+The record format version is kept apart from the software version: it is only
+raised when a record encoded in a newer format is written to the repository.
+"""
+
+
+def set_repository_record_format(branchenv: lmdb.Environment) -> bool:
+    """Mark the repository as holding records in the ``current_record_format``.
+
+    Called on the write paths (commits and arrayset schemas created under the
+    writer lock, or received from a remote) right before such a record is
+    written. The marker is left alone if it already covers the current format,
+    so this only writes to the branch db once per repository.
+
+    Parameters
+    ----------
+    branchenv : lmdb.Environment
+        db where the head, branch, and version specs are stored
+
+    Returns
+    -------
+    bool
+        True if the marker was written, False if it was already up to date.
+    """
+    repo_fmt = get_repository_record_format_spec(branchenv)
+    if can_read_records_written_by(repo_fmt, current_record_format):
+        return False
+
+    formatKey = parsing.repo_record_format_db_key()
+    formatVal = parsing.repo_version_db_val_from_raw_val(v_spec=current_record_format)
+    branchTxn = TxnRegister().begin_writer_txn(branchenv)
+    try:
+        success = branchTxn.put(formatKey, formatVal, overwrite=True)
+    finally:
+        TxnRegister().commit_writer_txn(branchenv)
+    return success
+
+
+def get_repository_record_format_spec(branchenv: lmdb.Environment) -> VersionSpec:
+    """Get the record format version of the records stored in the repository.
+
+    Parameters
+    ----------
+    branchenv : lmdb.Environment
+        db where the head, branch, and version specs are stored
+
+    Returns
+    -------
+    VersionSpec
+        release which introduced the newest record format written to the
+        repository. Repositories holding only records written before the first
+        format change have no marker, and are reported as ``0.0.0``.
+    """
+    formatKey = parsing.repo_record_format_db_key()
+    branchTxn = TxnRegister().begin_reader_txn(branchenv)
+    try:
+        formatVal = branchTxn.get(formatKey, default=False)
+    finally:
+        TxnRegister().abort_reader_txn(branchenv)
+
+    if formatVal is False:
+        return VersionSpec(major=0, minor=0, micro=0)
+    return parsing.repo_version_raw_val_from_db_val(formatVal)
+
+
 """
 Version compatibility checking
 ------------------------------
 
-Right now this is a dummy method, which just returns true, but it is important to
-have as we move to compatible changes in the future.
+Repositories (and remotes) record the software version which wrote them. Two
+kinds of changes are tracked here:
+
+- ``incompatible_changes_after``: repositories written by these versions can
+  not be opened by any later version.
+- ``record_format_changes``: releases which changed how record values are
+  encoded. Later versions still read the older encodings, but software older
+  than one of these can not read records written in it (or anything later).
+
+Record formats are compared through ``current_record_format`` rather than the
+software version, so a format change is gated on from the commit which makes
+it, not from the release which eventually ships it. Releases which predate
+this scheme (hangar <= 0.3.0) do not check record formats at all.
 """
 
 
 incompatible_changes_after = [VersionSpec(major=0, minor=2, micro=0)]
 
+# 0.4.0: commit specs are tagged msgpack arrays (were blosc compressed keyed json)
+#        and arrayset schemas tagged json arrays (were keyed json).
+record_format_changes = [VersionSpec(major=0, minor=4, micro=0)]
+
+# newest record format this software reads and writes.
+current_record_format = record_format_changes[-1]
+
+
+def can_read_records_written_by(reader_v: VersionSpec, writer_v: VersionSpec) -> bool:
+    """Determine if a reader at record format ``reader_v`` can decode records at ``writer_v``.
+
+    Parameters
+    ----------
+    reader_v : VersionSpec
+        record format version of the reading side.
+    writer_v : VersionSpec
+        record format version which the records were written in.
+
+    Returns
+    -------
+    bool
+        False if any record format change happened after ``reader_v`` up to and
+        including ``writer_v``, otherwise True.
+    """
+    return not any((reader_v < change <= writer_v) for change in record_format_changes)
+
 
 def is_repo_software_version_compatible(repo_v: VersionSpec, curr_v: VersionSpec) -> bool:
     """Determine if the repo on disk and the current Hangar versions iscompatible.
@@ -187,4 +292,4 @@ def is_repo_software_version_compatible(repo_v: VersionSpec, curr_v: VersionSpec
         elif curr_v.micro > repo_v.micro:
             return False
 
-    return True
\ No newline at end of file
+    return True
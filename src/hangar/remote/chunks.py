@@ -1,3 +1,4 @@
+import io
 import math
 
 import blosc
@@ -9,20 +10,27 @@ from ..utils import set_blosc_nthreads
 set_blosc_nthreads()
 
 
-def chunk_bytes(bytesData):
+# Each chunk is sent as its own message; larger chunks mean fewer messages
+# (and HTTP/2 frames / writes) per stream, while staying well below the 4MB
+# default receive limit of grpc peers.
+CHUNK_NBYTES = 1_000_000
+
+
+def chunk_bytes(bytesData, chunkSize=CHUNK_NBYTES):
     """Slice a bytestring into subelements and store the data in a list
 
     Arguments
     ---------
         bytesData : bytes
             bytestring buffer of the array data
+        chunkSize : int, optional
+            max number of bytes in each chunk, by default CHUNK_NBYTES
 
     Yields
     ------
     bytes
-        data split into 32kb chunk sizes.
+        data split into chunks of at most `chunkSize` bytes.
     """
-    chunkSize = 32_000
     numIters = math.ceil(len(bytesData) / chunkSize)
     currentStart = 0
     currentEnd = chunkSize
@@ -72,10 +80,14 @@ def clientCommitChunkedIterator(commit: str, parentVal: bytes, specVal: bytes,
 
 
 def tensorChunkedIterator(buf, uncomp_nbytes, itemsize, pb2_request, *, err=None):
+    """Compress packed tensor records and split them into chunked requests.
 
-    buf.seek(0)
+    ``buf`` is either an ``io.BytesIO`` or any bytes-like object holding
+    exactly the packed records.
+    """
     compBytes = blosc.compress(
-        buf.getbuffer(), clevel=5, cname='blosclz', typesize=itemsize, shuffle=blosc.SHUFFLE)
+        buf.getbuffer() if isinstance(buf, io.BytesIO) else buf,
+        clevel=5, cname='blosclz', typesize=itemsize, shuffle=blosc.SHUFFLE)
 
     request = pb2_request(
         comp_nbytes=len(compBytes),
@@ -26,12 +26,17 @@ from ..records import heads
 from ..records import parsing
 from ..records import queries
 from ..records import summarize
+from ..records import vcompat
 from ..utils import set_blosc_nthreads
 
 set_blosc_nthreads()
 
 logger = logging.getLogger(__name__)
 
+# advertise every codec grpc core implements (none, deflate, gzip) so the
+# channel can negotiate with servers configured with a different default.
+_GRPC_COMPRESSION_ALGORITHMS = sum(1 << alg.value for alg in grpc.Compression)
+
 
 class HangarClient(object):
     """Client which connects and handles data transfer to the hangar server.
@@ -73,6 +78,9 @@ class HangarClient(object):
         self.channel: grpc.Channel = None
         self.stub: hangar_service_pb2_grpc.HangarServiceStub = None
         self.header_adder_int = header_adder_interceptor(auth_username, auth_password)
+        self.record_format_header_int = header_adder_interceptor(
+            c.HEADER_CLIENT_RECORD_FORMAT,
+            parsing.repo_version_raw_string_from_raw_spec(vcompat.current_record_format))
 
         self.cfg: dict = {}
         self._rFs: BACKEND_ACCESSOR_MAP = {}
@@ -91,7 +99,8 @@ class HangarClient(object):
         """get grpc client configuration from server and setup channel and stub for use.
         """
         tmp_insec_channel = grpc.insecure_channel(self.address)
-        tmp_channel = grpc.intercept_channel(tmp_insec_channel, self.header_adder_int)
+        tmp_channel = grpc.intercept_channel(
+            tmp_insec_channel, self.header_adder_int, self.record_format_header_int)
         tmp_stub = hangar_service_pb2_grpc.HangarServiceStub(tmp_channel)
         t_init, t_tot = time.time(), 0
         while t_tot < self.wait_ready_timeout:
@@ -101,6 +110,8 @@ class HangarClient(object):
                 self.cfg['push_max_nbytes'] = int(response.config['push_max_nbytes'])
                 self.cfg['enable_compression'] = bool(int(response.config['enable_compression']))
                 self.cfg['optimization_target'] = response.config['optimization_target']
+                # servers which predate record format versions do not report one
+                self.cfg['record_format'] = response.config.get('record_format', '0.0.0')
             except grpc.RpcError as err:
                 if not (err.code() == grpc.StatusCode.UNAVAILABLE) and (self.wait_ready is True):
                     logger.error(err)
@@ -116,13 +127,41 @@ class HangarClient(object):
 
         tmp_channel.close()
         tmp_insec_channel.close()
+        if self.cfg['enable_compression']:
+            compression = grpc.Compression.Deflate
+        else:
+            compression = grpc.Compression.NoCompression
         configured_channel = grpc.insecure_channel(
             self.address,
-            options=[('grpc.default_compression_algorithm', self.cfg['enable_compression']),
-                     ('grpc.optimization_target', self.cfg['optimization_target'])])
-        self.channel = grpc.intercept_channel(configured_channel, self.header_adder_int)
+            options=[('grpc.default_compression_algorithm', compression.value),
+                     ('grpc.compression_enabled_algorithms_bitset', _GRPC_COMPRESSION_ALGORITHMS),
+                     ('grpc.optimization_target', self.cfg['optimization_target']),
+                     ('grpc.max_send_message_length', c.GRPC_MAX_MESSAGE_NBYTES),
+                     ('grpc.max_receive_message_length', c.GRPC_MAX_MESSAGE_NBYTES)])
+        self.channel = grpc.intercept_channel(
+            configured_channel, self.header_adder_int, self.record_format_header_int)
         self.stub = hangar_service_pb2_grpc.HangarServiceStub(self.channel)
 
+    def _raise_if_server_outdated(self):
+        """Refuse to send records the server can not decode.
+
+        Raises
+        ------
+        RuntimeError
+            If the server reads only record formats older than the one this
+            client's repository holds.
+        """
+        server_fmt = parsing.repo_version_raw_spec_from_raw_string(self.cfg['record_format'])
+        repo_fmt = vcompat.get_repository_record_format_spec(self.env.branchenv)
+        if not vcompat.can_read_records_written_by(server_fmt, repo_fmt):
+            client_fmt_str = parsing.repo_version_raw_string_from_raw_spec(repo_fmt)
+            err = RuntimeError(
+                f'Remote server at {self.address} reads records up to format '
+                f'{self.cfg["record_format"]}, which can not read records written by this '
+                f'client (format {client_fmt_str}). Please upgrade the server.')
+            logger.error(err)
+            raise err
+
     def close(self):
         """Close reader file handles and the GRPC channel connection, invalidating this instance.
         """
@@ -203,7 +242,13 @@ class HangarClient(object):
         -------
         hangar_service_pb2.PushBranchRecordReply
             standard error proto
+
+        Raises
+        ------
+        RuntimeError
+            If the server can not read commit records written by this client.
         """
+        self._raise_if_server_outdated()
         cIter = chunks.clientCommitChunkedIterator(commit=commit,
                                                    parentVal=parentVal,
                                                    specVal=specVal,
@@ -279,7 +324,13 @@ class HangarClient(object):
         -------
         hangar_service_pb2.PushSchemaReply
             standard error proto indicating success
+
+        Raises
+        ------
+        RuntimeError
+            If the server can not read schema records written by this client.
         """
+        self._raise_if_server_outdated()
         rec = hangar_service_pb2.SchemaRecord(digest=schema_hash,
                                               blob=schemaVal)
         request = hangar_service_pb2.PushSchemaRequest(rec=rec)
@@ -351,10 +402,11 @@ class HangarClient(object):
         received_data = []
         for data in unpacker:
             hdigest, dShape, dTypeN, ddBytes = data
-            tensor = np.frombuffer(ddBytes, dtype=np.typeDict[dTypeN]).reshape(dShape)
-            received_hash = hashlib.blake2b(tensor.tobytes(), digest_size=20).hexdigest()
+            # received bytes are the server's `tensor.tobytes()`; hash them in place
+            received_hash = hashlib.blake2b(ddBytes, digest_size=20).hexdigest()
             if received_hash != hdigest:
                 raise RuntimeError(f'MANGLED! got: {received_hash} != requested: {hdigest}')
+            tensor = np.frombuffer(ddBytes, dtype=np.sctypeDict[dTypeN]).reshape(dShape)
             received_data.append((received_hash, tensor))
         return received_data
 
@@ -524,7 +576,7 @@ class HangarClient(object):
         if tmpDB is None:
             with tempfile.TemporaryDirectory() as tempD:
                 tmpDF = os.path.join(tempD, 'test.lmdb')
-                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
                 commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
                 c_hashs_schemas = queries.RecordQuery(tmpDB).data_hash_to_schema_hash()
                 c_hashes = list(set(c_hashs_schemas.keys()))
@@ -551,7 +603,7 @@ class HangarClient(object):
 
     def fetch_find_missing_labels(self, commit):
         c_hash_keys = hashs.HashQuery(self.env.labelenv).list_all_hash_keys_db()
-        c_hashset = set(map(parsing.hash_meta_raw_key_from_db_key, c_hash_keys))
+        c_hashset = set(parsing.hash_meta_raw_keys_from_db_keys(c_hash_keys))
         c_hashes = list(c_hashset)
 
         pb2_func = hangar_service_pb2.FindMissingLabelsRequest
@@ -574,7 +626,7 @@ class HangarClient(object):
         if tmpDB is None:
             with tempfile.TemporaryDirectory() as tempD:
                 tmpDF = os.path.join(tempD, 'test.lmdb')
-                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
                 commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
                 c_hashset = set(queries.RecordQuery(tmpDB).metadata_hashes())
                 c_hashes = list(c_hashset)
@@ -614,7 +666,7 @@ class HangarClient(object):
         if tmpDB is None:
             with tempfile.TemporaryDirectory() as tempD:
                 tmpDF = os.path.join(tempD, 'test.lmdb')
-                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
                 commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
                 c_schemaset = set(queries.RecordQuery(tmpDB).schema_hashes())
                 c_schemas = list(c_schemaset)
@@ -0,0 +1,79 @@
+"""Interceptor that sheds load once too many rpcs are admitted at once.
+
+Rather than letting new calls queue (unbounded) behind a saturated thread pool,
+calls arriving while ``limit`` calls are already running *or queued* for a grpc
+thread are immediately rejected with ``UNAVAILABLE`` so that clients may back
+off and retry.
+
+Calls are counted by the :class:`AdmissionCountingThreadPool` the server runs
+them on: from the moment grpc submits a call to the pool until the submitted
+work returns, whether or not the handler itself ever executes (a call cancelled
+while queued still finishes its pool work item). grpc looks up the handler (and
+so runs this interceptor) and submits the call from the same serving thread, so
+the count checked on admission already includes every call admitted before it.
+
+A rejected call still needs a pool thread to send its status, so the limit must
+stay below the pool size so that some threads are always left to run rejections.
+"""
+import threading
+from concurrent import futures
+from os.path import split
+
+import grpc
+
+from .request_header_validator_interceptor import _select_rpc_terminator
+
+
+class AdmissionCountingThreadPool(futures.ThreadPoolExecutor):
+    """Thread pool which counts the work items submitted to it and not yet finished.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._admitted = 0
+        self._admitted_lock = threading.Lock()
+
+    @property
+    def admitted(self) -> int:
+        """Number of work items running or waiting for a thread."""
+        with self._admitted_lock:
+            return self._admitted
+
+    def _finished(self, future):
+        with self._admitted_lock:
+            self._admitted -= 1
+
+    def submit(self, fn, *args, **kwargs):
+        with self._admitted_lock:
+            self._admitted += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            self._finished(None)
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+
+class ConcurrencyLimitInterceptor(grpc.ServerInterceptor):
+
+    def __init__(self, limit, thread_pool: AdmissionCountingThreadPool,
+                 code=grpc.StatusCode.UNAVAILABLE,
+                 details='SERVER OVERLOADED: TOO MANY CONCURRENT REQUESTS'):
+        if limit < 1:
+            raise ValueError(f'concurrency limit must be at least 1, not {limit}')
+        self._limit = limit
+        self._thread_pool = thread_pool
+        self._code = code
+        self._details = details
+
+    @property
+    def in_flight(self) -> int:
+        """Number of admitted rpcs which are running or queued."""
+        return self._thread_pool.admitted
+
+    def intercept_service(self, continuation, handler_call_details):
+        if self._thread_pool.admitted >= self._limit:
+            _, intercepted_method = split(handler_call_details.method)
+            return _select_rpc_terminator(intercepted_method)(self._code, self._details)
+        return continuation(handler_call_details)
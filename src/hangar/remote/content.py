@@ -4,7 +4,7 @@ import numpy as np
 
 from ..context import Environments, TxnRegister
 from ..backends import BACKEND_ACCESSOR_MAP
-from ..records import parsing
+from ..records import parsing, vcompat
 
 
 class ContentWriter(object):
@@ -50,6 +50,7 @@ class ContentWriter(object):
         commitSpecKey = parsing.commit_spec_db_key_from_raw_key(commit)
         commitParentKey = parsing.commit_parent_db_key_from_raw_key(commit)
         commitRefKey = parsing.commit_ref_db_key_from_raw_key(commit)
+        vcompat.set_repository_record_format(self.env.branchenv)
         refTxn = TxnRegister().begin_writer_txn(self.env.refenv)
         try:
             cmtParExists = refTxn.put(commitParentKey, parentVal, overwrite=False)
@@ -79,6 +80,7 @@ class ContentWriter(object):
             False if the schema_hash existed in db and no records written.
         """
         schemaKey = parsing.hash_schema_db_key_from_raw_key(schema_hash)
+        vcompat.set_repository_record_format(self.env.branchenv)
         hashTxn = TxnRegister().begin_writer_txn(self.env.hashenv)
         try:
             schemaExists = hashTxn.put(schemaKey, schemaVal, overwrite=False)
@@ -127,7 +129,7 @@ class ContentWriter(object):
         backend = accessor(
             repo_path=self.env.repo_path,
             schema_shape=schema_val.schema_max_shape,
-            schema_dtype=np.typeDict[int(schema_val.schema_dtype)])
+            schema_dtype=np.sctypeDict[int(schema_val.schema_dtype)])
         backend.open(mode='a', remote_operation=True)
 
         saved_digests = []
@@ -151,7 +153,8 @@ class ContentWriter(object):
         digest : str
             hash digest of the label value being written
         labelVal : bytes
-            db formatted representation of the label content
+            db formatted representation of the label content; any bytes-like
+            object is accepted and is not retained after the call.
 
         Returns
         -------
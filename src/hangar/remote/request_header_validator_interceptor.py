@@ -66,7 +66,7 @@ def _unary_stream_rpc_terminator(code, details):
 def _stream_unary_rpc_terminator(code, details):
     def terminate(ignored_request, context):
         context.abort(code, details)
-    return grpc.unary_stream_rpc_method_handler(terminate)
+    return grpc.stream_unary_rpc_method_handler(terminate)
 
 
 def _stream_stream_rpc_terminator(code, details):
@@ -1,12 +1,17 @@
 import hashlib
-import io
+import inspect
 import os
+import struct
 import tempfile
 import warnings
 import threading
 import time
+from collections import deque
 from concurrent import futures
+from functools import lru_cache, wraps
+from itertools import islice
 from os.path import join as pjoin
+from typing import FrozenSet, Mapping, NamedTuple
 
 import blosc
 import grpc
@@ -16,6 +21,7 @@ import numpy as np
 
 from . import config
 from . import chunks
+from . import concurrency_limit_interceptor
 from . import hangar_service_pb2
 from . import hangar_service_pb2_grpc
 from . import request_header_validator_interceptor
@@ -23,15 +29,170 @@ from .content import ContentWriter
 from .. import constants as c
 from ..context import Environments, TxnRegister
 from ..backends.selection import BACKEND_ACCESSOR_MAP, backend_decoder
-from ..records import commiting, hashs, heads, parsing, queries, summarize
+from ..records import commiting, hashs, heads, parsing, queries, summarize, vcompat
 from ..utils import set_blosc_nthreads
 
 set_blosc_nthreads()
 
+# hashlib releases the GIL while hashing large buffers, so verification of
+# pushed tensors is spread over a pool shared by all server instances.
+_HASH_POOL_WORKERS = os.cpu_count() or 1
+_HASH_POOL = futures.ThreadPoolExecutor(
+    max_workers=_HASH_POOL_WORKERS, thread_name_prefix='hangar_hash_pool')
+
+
+def _blake2b_hexdigests(buffers):
+    return [hashlib.blake2b(buf, digest_size=20).hexdigest() for buf in buffers]
+
+
+def _parallel_blake2b_hexdigests(buffers):
+    """digest of each buffer in order, hashed in one batch per pool worker"""
+    nbatch = -(-len(buffers) // _HASH_POOL_WORKERS)
+    if nbatch <= 1 or _HASH_POOL_WORKERS == 1:
+        return _blake2b_hexdigests(buffers)
+    batches = [buffers[i:i + nbatch] for i in range(0, len(buffers), nbatch)]
+    return [d for batch in _HASH_POOL.map(_blake2b_hexdigests, batches) for d in batch]
+
+
+# request payloads are decompressed (and fetch replies packed) into buffers kept
+# per handler thread; buffers larger than this are allocated for the single
+# request and released.
+_SLAB_MAX_NBYTES = 64_000_000
+_UNPACK_FEED_NBYTES = 1_000_000
+_FETCH_SCRATCH_MIN_NBYTES = 1 << 20
+_FETCH_READAHEAD = 8
+
+_MSGPACK_FIXARRAY_4 = b'\x94'
+_MSGPACK_BIN32_HEAD = struct.Struct('>BI')
+
+
+def _pack_tensor_record_head(packer, digest, tensor):
+    """msgpack encoding of ``(digest, shape, dtype.num, tensor.tobytes())``
+    up to, but not including, the tensor bytes.
+
+    The tensor bytes are always framed as bin32 so they can be copied in after
+    the head without knowing their size class; clients unpack the record
+    exactly as if it had been produced by ``packer.pack`` in one call.
+    """
+    return b''.join((
+        _MSGPACK_FIXARRAY_4,
+        packer.pack(digest),
+        packer.pack(tensor.shape),
+        packer.pack(tensor.dtype.num),
+        _MSGPACK_BIN32_HEAD.pack(0xc6, tensor.nbytes),
+    ))
+
+
+# advertise every codec grpc core implements (none, deflate, gzip) so peers
+# configured with a different default can still negotiate with the server.
+_GRPC_COMPRESSION_ALGORITHMS = sum(1 << alg.value for alg in grpc.Compression)
+
+# labels below this size are sent as a stored (clevel=0) blosc frame, which any
+# client decompresses as usual without paying for a codec pass.
+_LABEL_COMPRESS_MIN_NBYTES = 1024
+
+
+def _iter_unpack(view, **kwargs):
+    """unpack objects from a buffer, feeding the unpacker a piece at a time"""
+    unpacker = msgpack.Unpacker(**kwargs)
+    for start in range(0, len(view), _UNPACK_FEED_NBYTES):
+        unpacker.feed(view[start:start + _UNPACK_FEED_NBYTES])
+        yield from unpacker
+
+
+CommitQueries = NamedTuple('CommitQueries', [
+    ('data_hash_to_schema_hash', Mapping[str, str]),
+    ('metadata_hashes', FrozenSet[str]),
+    ('schema_hashes', FrozenSet[str]),
+])
+CommitQueries.__doc__ = 'Records of a commit compared against by the find-missing handlers'
+
+# full record queries of large commits can be sizable; only the most recently
+# requested are kept.
+_COMMIT_QUERIES_CACHE_SIZE = 8
+
+
+# The bulk data handlers (FetchData / PushData) are CPU heavy (decompression,
+# hashing, packing), so only part of the grpc thread pool may run them at once;
+# the remaining threads stay free to answer short rpcs (commit, find-missing,
+# branch, schema, label, ping).
+_BULK_TRANSFER_ABORT_DETAILS = 'SERVER BUSY: TOO MANY CONCURRENT DATA TRANSFERS'
+
+
+def _bulk_transfer_slots(max_thread_pool_workers: int) -> int:
+    """number of bulk transfers admitted at once by a server with this many grpc threads"""
+    return max(1, max_thread_pool_workers // 2)
+
+
+def _bulk_transfer(method):
+    """Run the decorated handler while holding one of the server's bulk
+    transfer slots.
+
+    A call arriving while every slot is taken is aborted immediately with
+    ``UNAVAILABLE`` rather than blocking a grpc thread until a slot frees up;
+    clients back off and retry it. (``RESOURCE_EXHAUSTED`` already tells a
+    FetchData client that a partial reply was sent and the rest should be
+    requested again.) Generator (server streaming) handlers hold their slot until the
+    stream is exhausted or cancelled, which is exactly as long as they occupy
+    a grpc thread.
+    """
+    if inspect.isgeneratorfunction(method):
+        @wraps(method)
+        def wrapper(self, request, context):
+            slots = self._bulk_slots
+            if slots is None:
+                yield from method(self, request, context)
+                return
+            if not slots.acquire(blocking=False):
+                context.abort(grpc.StatusCode.UNAVAILABLE, _BULK_TRANSFER_ABORT_DETAILS)
+            try:
+                yield from method(self, request, context)
+            finally:
+                slots.release()
+    else:
+        @wraps(method)
+        def wrapper(self, request, context):
+            slots = self._bulk_slots
+            if slots is None:
+                return method(self, request, context)
+            if not slots.acquire(blocking=False):
+                context.abort(grpc.StatusCode.UNAVAILABLE, _BULK_TRANSFER_ABORT_DETAILS)
+            try:
+                return method(self, request, context)
+            finally:
+                slots.release()
+    return wrapper
+
+
+def _response_compression(algorithm):
+    """Compress the decorated handler's responses with ``algorithm``, whatever
+    the server-wide default.
+
+    Blosc compressed payloads gain nothing from a second pass over the wire,
+    while replies made of plain digest strings shrink well under gzip.
+    """
+    def decorator(method):
+        if inspect.isgeneratorfunction(method):
+            @wraps(method)
+            def wrapper(self, request, context):
+                context.set_compression(algorithm)
+                yield from method(self, request, context)
+        else:
+            @wraps(method)
+            def wrapper(self, request, context):
+                context.set_compression(algorithm)
+                return method(self, request, context)
+        return wrapper
+    return decorator
+
+
+_uncompressed_response = _response_compression(grpc.Compression.NoCompression)
+_gzip_response = _response_compression(grpc.Compression.Gzip)
+
 
 class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
-    def __init__(self, repo_path, overwrite=False):
+    def __init__(self, repo_path, overwrite=False, *, max_bulk_transfers=None):
 
         with warnings.catch_warnings():
             warnings.simplefilter('ignore', UserWarning)
@@ -42,10 +203,23 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
             self.env._init_repo(
                 user_name='SERVER_USER',
                 user_email='SERVER_USER@HANGAR.SERVER',
+                repo_desc='SERVER_REPO',
                 remove_old=overwrite)
         except OSError:
             pass
 
+        # None leaves bulk transfers unbounded; serve() sizes it from its pool.
+        if max_bulk_transfers is None:
+            self._bulk_slots = None
+        else:
+            self._bulk_slots = threading.BoundedSemaphore(max_bulk_transfers)
+        self._slabs = threading.local()
+        self._scratch_dir = tempfile.TemporaryDirectory(prefix='hangar_server_scratch_')
+        self._scratch_env = lmdb.open(
+            path=pjoin(self._scratch_dir.name, 'scratch.lmdb'), **c.LMDB_TMP_SETTINGS)
+        self._scratch_lock = threading.Lock()
+        self._commit_queries = lru_cache(maxsize=_COMMIT_QUERIES_CACHE_SIZE)(
+            self._load_commit_queries)
         self._rFs = {}
         for backend, accessor in BACKEND_ACCESSOR_MAP.items():
             if accessor is not None:
@@ -64,6 +238,78 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         self.data_dir = pjoin(self.repo_path, c.DIR_DATA)
         self.CW = ContentWriter(self.env)
 
+    def _decompress_to_slab(self, compBytes):
+        """Decompress a blosc buffer into the calling thread's reusable slab.
+
+        Parameters
+        ----------
+        compBytes : bytes-like
+            blosc compressed buffer received from the client.
+
+        Returns
+        -------
+        memoryview
+            view of the uncompressed bytes. It is only valid until the next
+            call on the same thread; anything retained must be copied out.
+        """
+        nbytes = struct.unpack_from('<I', compBytes, 4)[0]
+        slab = getattr(self._slabs, 'buf', None)
+        if slab is None or slab.nbytes < nbytes:
+            slab = np.empty(nbytes, dtype=np.uint8)
+            if nbytes <= _SLAB_MAX_NBYTES:
+                self._slabs.buf = slab
+        written = blosc.decompress_ptr(compBytes, slab.ctypes.data)
+        return slab.data[:written]
+
+    def _load_commit_queries(self, commit):
+        """Unpack a commit into the scratch db and query the records the
+        find-missing handlers compare against.
+
+        The scratch db is opened once per server and emptied after each use,
+        so calls are serialized on ``self._scratch_lock``.
+
+        Commits are immutable once written, so results are cached per digest
+        (see ``self._commit_queries``) and never need to be invalidated. They
+        hold only ``str`` digests copied out of the scratch db, so they stay
+        valid after it is emptied and refilled for another commit.
+        """
+        with self._scratch_lock:
+            try:
+                commiting.unpack_commit_ref(self.env.refenv, self._scratch_env, commit)
+                query = queries.RecordQuery(self._scratch_env)
+                res = CommitQueries(
+                    data_hash_to_schema_hash=query.data_hash_to_schema_hash(),
+                    metadata_hashes=frozenset(query.metadata_hashes()),
+                    schema_hashes=frozenset(query.schema_hashes()))
+            finally:
+                with self._scratch_env.begin(write=True) as txn:
+                    txn.drop(self._scratch_env.open_db(), delete=False)
+        return res
+
+    def _abort_if_client_outdated(self, context):
+        """Refuse to send records the calling client can not decode.
+
+        Clients are gated on the record format this server's repository
+        actually holds, so a repository with only legacy records still serves
+        clients which predate record format versions. Those send no record
+        format header; they are treated as predating every record format change.
+        """
+        metadata = dict(context.invocation_metadata())
+        client_fmt_str = metadata.get(c.HEADER_CLIENT_RECORD_FORMAT, '0.0.0')
+        client_fmt = parsing.repo_version_raw_spec_from_raw_string(client_fmt_str)
+        repo_fmt = vcompat.get_repository_record_format_spec(self.env.branchenv)
+        if not vcompat.can_read_records_written_by(client_fmt, repo_fmt):
+            server_fmt_str = parsing.repo_version_raw_string_from_raw_spec(repo_fmt)
+            msg = f'CLIENT RECORD FORMAT: {client_fmt_str} CAN NOT READ RECORDS IN '\
+                  f'SERVER RECORD FORMAT: {server_fmt_str}. PLEASE UPGRADE THE CLIENT.'
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, msg)
+
+    def _read_tensor(self, hashVal):
+        """Read the tensor stored under a db formatted data hash value.
+        """
+        spec = backend_decoder(hashVal)
+        return self._rFs[spec.backend].read_data(spec)
+
     # -------------------- Client Config --------------------------------------
 
     def PING(self, request, context):
@@ -85,6 +331,10 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         reply.config['push_max_nbytes'] = push_max_nbytes
         reply.config['enable_compression'] = enable_compression
         reply.config['optimization_target'] = optimization_target
+        # newest record format this server can read (and so accept in a push);
+        # what it sends is gated on its repository's format instead.
+        reply.config['record_format'] = parsing.repo_version_raw_string_from_raw_spec(
+            vcompat.current_record_format)
         return reply
 
     # -------------------- Branch Record --------------------------------------
@@ -111,41 +361,53 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         """
         branch_name = request.rec.name
         commit = request.rec.commit
-        branch_names = heads.get_branch_names(self.env.branchenv)
-        if branch_name not in branch_names:
-            heads.create_branch(self.env.branchenv, name=branch_name, base_commit=commit)
-            err = hangar_service_pb2.ErrorProto(code=0, message='OK')
+        branchHeadKey = parsing.repo_branch_head_db_key_from_raw_key(branch_name)
+        branchHeadVal = parsing.repo_branch_head_db_val_from_raw_val(commit)
+
+        # the existence check, head comparison, and update are made in one
+        # writer txn rather than a branch scan plus separate read/write txns.
+        branchTxn = self.txnregister.begin_writer_txn(self.env.branchenv)
+        try:
+            currentHeadVal = branchTxn.get(branchHeadKey, default=False)
+            if currentHeadVal != branchHeadVal:
+                branchTxn.put(branchHeadKey, branchHeadVal)
+        finally:
+            self.txnregister.commit_writer_txn(self.env.branchenv)
+
+        if currentHeadVal == branchHeadVal:
+            current_head = parsing.repo_branch_head_raw_val_from_db_val(currentHeadVal)
+            msg = f'NO CHANGE TO BRANCH: {branch_name} WITH HEAD: {current_head}'
+            context.set_details(msg)
+            context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+            err = hangar_service_pb2.ErrorProto(code=6, message=msg)
         else:
-            current_head = heads.get_branch_head_commit(self.env.branchenv, branch_name)
-            if current_head == commit:
-                msg = f'NO CHANGE TO BRANCH: {branch_name} WITH HEAD: {current_head}'
-                context.set_details(msg)
-                context.set_code(grpc.StatusCode.ALREADY_EXISTS)
-                err = hangar_service_pb2.ErrorProto(code=6, message=msg)
-            else:
-                heads.set_branch_head_commit(self.env.branchenv, branch_name, commit)
-                err = hangar_service_pb2.ErrorProto(code=0, message='OK')
+            err = hangar_service_pb2.ErrorProto(code=0, message='OK')
 
         reply = hangar_service_pb2.PushBranchRecordReply(error=err)
         return reply
 
     # -------------------------- Commit Record --------------------------------
 
+    @_uncompressed_response
     def FetchCommit(self, request, context):
         """Return raw data representing contents, spec, and parents of a commit hash.
         """
+        self._abort_if_client_outdated(context)
         commit = request.commit
         commitRefKey = parsing.commit_ref_db_key_from_raw_key(commit)
         commitParentKey = parsing.commit_parent_db_key_from_raw_key(commit)
         commitSpecKey = parsing.commit_spec_db_key_from_raw_key(commit)
 
-        reftxn = self.txnregister.begin_reader_txn(self.env.refenv)
-        try:
+        # A private buffers txn (never shared through the register, whose other
+        # users expect bytes) lets each reply chunk be copied straight out of
+        # the memory map rather than out of an intermediate copy of the ref.
+        with self.env.refenv.begin(write=False, buffers=True) as reftxn:
             commitRefVal = reftxn.get(commitRefKey, default=False)
-            commitParentVal = reftxn.get(commitParentKey, default=False)
-            commitSpecVal = reftxn.get(commitSpecKey, default=False)
-        finally:
-            self.txnregister.abort_reader_txn(self.env.refenv)
+            if commitRefVal is not False:
+                bsize = len(commitRefVal)
+                refChunks = [bytes(chunk) for chunk in chunks.chunk_bytes(commitRefVal)]
+                commitParentVal = bytes(reftxn.get(commitParentKey))
+                commitSpecVal = bytes(reftxn.get(commitSpecKey))
 
         if commitRefVal is False:
             msg = f'COMMIT: {commit} DOES NOT EXIST ON SERVER'
@@ -154,15 +416,13 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
             err = hangar_service_pb2.ErrorProto(code=5, message=msg)
             reply = hangar_service_pb2.FetchCommitReply(commit=commit, error=err)
             yield reply
-            raise StopIteration()
+            return
         else:
-            raw_data_chunks = chunks.chunk_bytes(commitRefVal)
-            bsize = len(commitRefVal)
             commit_proto = hangar_service_pb2.CommitRecord()
             commit_proto.parent = commitParentVal
             commit_proto.spec = commitSpecVal
             reply = hangar_service_pb2.FetchCommitReply(commit=commit, total_byte_size=bsize)
-            for chunk in raw_data_chunks:
+            for chunk in refChunks:
                 commit_proto.ref = chunk
                 reply.record.CopyFrom(commit_proto)
                 yield reply
@@ -172,15 +432,14 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
         Will not overwrite data if a commit hash is already recorded on the server.
         """
+        refParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 commit = request.commit
-                refBytes, offset = bytearray(request.total_byte_size), 0
                 specVal = request.record.spec
                 parentVal = request.record.parent
-            size = len(request.record.ref)
-            refBytes[offset: offset + size] = request.record.ref
-            offset += size
+            refParts.append(request.record.ref)
+        refBytes = b''.join(refParts)
 
         digest = self.CW.commit(commit, parentVal, specVal, refBytes)
         if not digest:
@@ -200,25 +459,27 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
     def FetchSchema(self, request, context):
         """Return the raw byte specification of a particular schema with requested hash.
         """
+        self._abort_if_client_outdated(context)
         schema_hash = request.rec.digest
         schemaKey = parsing.hash_schema_db_key_from_raw_key(schema_hash)
         hashTxn = self.txnregister.begin_reader_txn(self.env.hashenv)
         try:
             schemaExists = hashTxn.get(schemaKey, default=False)
-            if schemaExists is not False:
-                print(f'found schema: {schema_hash}')
-                rec = hangar_service_pb2.SchemaRecord(digest=schema_hash, blob=schemaExists)
-                err = hangar_service_pb2.ErrorProto(code=0, message='OK')
-            else:
-                print(f'not exists: {schema_hash}')
-                msg = f'SCHEMA HASH: {schema_hash} DOES NOT EXIST ON SERVER'
-                context.set_details(msg)
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                err = hangar_service_pb2.ErrorProto(code=5, message=msg)
-                rec = hangar_service_pb2.SchemaRecord(digest=schema_hash)
         finally:
             self.txnregister.abort_reader_txn(self.env.hashenv)
 
+        if schemaExists is not False:
+            print(f'found schema: {schema_hash}')
+            rec = hangar_service_pb2.SchemaRecord(digest=schema_hash, blob=schemaExists)
+            err = hangar_service_pb2.ErrorProto(code=0, message='OK')
+        else:
+            print(f'not exists: {schema_hash}')
+            msg = f'SCHEMA HASH: {schema_hash} DOES NOT EXIST ON SERVER'
+            context.set_details(msg)
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            err = hangar_service_pb2.ErrorProto(code=5, message=msg)
+            rec = hangar_service_pb2.SchemaRecord(digest=schema_hash)
+
         reply = hangar_service_pb2.FetchSchemaReply(rec=rec, error=err)
         return reply
 
@@ -245,6 +506,8 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
     # ---------------------------- Data ---------------------------------------
 
+    @_bulk_transfer
+    @_uncompressed_response
     def FetchData(self, request_iterator, context):
         """Return a packed byte representation of samples corresponding to a digest.
 
@@ -252,16 +515,15 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         guarrenteed to fully complete in one operation.
         """
 
+        dParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 uncomp_nbytes = request.uncomp_nbytes
                 comp_nbytes = request.comp_nbytes
-                dBytes, offset = bytearray(comp_nbytes), 0
-            size = len(request.raw_data)
-            dBytes[offset: offset + size] = request.raw_data
-            offset += size
+            dParts.append(request.raw_data)
+        dBytes = b''.join(dParts)
 
-        uncompBytes = blosc.decompress(dBytes)
+        uncompBytes = self._decompress_to_slab(dBytes)
         if uncomp_nbytes != len(uncompBytes):
             msg = f'Expected nbytes data sent: {uncomp_nbytes} != received {comp_nbytes}'
             context.set_details(msg)
@@ -269,11 +531,10 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
             err = hangar_service_pb2.ErrorProto(code=15, message=msg)
             reply = hangar_service_pb2.FetchDataReply(error=err)
             yield reply
-            raise StopIteration()
+            return
 
-        buff = io.BytesIO(uncompBytes)
-        unpacker = msgpack.Unpacker(
-            buff, use_list=False, raw=False, max_buffer_size=1_000_000_000)
+        unpacker = _iter_unpack(
+            uncompBytes, use_list=False, raw=False, max_buffer_size=1_000_000_000)
 
         # We receive a list of digests to send to the client. One consideration
         # we have is that there is no way to know how much memory will be used
@@ -287,64 +548,92 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         # of digests/tensors off to them as is (incomplete), and request that
         # the client figure out what it still needs and ask us again.
 
-        totalSize = 0
-        buf = io.BytesIO()
-        packer = msgpack.Packer(use_bin_type=True)
+        # the reader txn is only held while digests are resolved to backend
+        # specs; tensors are read, packed, and sent after it is released.
+        # Keys are looked up in sorted order so the cursor walks the b-tree
+        # pages sequentially; replies keep the order the client asked for.
+        digests = list(unpacker)
+        hashKeys = parsing.hash_data_db_keys_from_raw_keys(digests)
+        hashVals, hashVal = {}, None
         hashTxn = self.txnregister.begin_reader_txn(self.env.hashenv)
-        fetch_max_nbytes = config.get('server.grpc.fetch_max_nbytes')
         try:
-            for digest in unpacker:
-                hashKey = parsing.hash_data_db_key_from_raw_key(digest)
-                hashVal = hashTxn.get(hashKey, default=False)
-                if hashVal is False:
-                    msg = f'HASH DOES NOT EXIST: {hashKey}'
-                    context.set_details(msg)
-                    context.set_code(grpc.StatusCode.NOT_FOUND)
-                    err = hangar_service_pb2.ErrorProto(code=5, message=msg)
-                    reply = hangar_service_pb2.FetchDataReply(error=err)
-                    yield reply
-                    raise StopIteration()
-                else:
-                    spec = backend_decoder(hashVal)
-                    tensor = self._rFs[spec.backend].read_data(spec)
-
-                p = packer.pack((digest, tensor.shape, tensor.dtype.num, tensor.tobytes()))
-                buf.seek(totalSize)
-                buf.write(p)
-                totalSize += len(p)
+            with hashTxn.cursor() as cursor:
+                for hashKey in sorted(hashKeys):
+                    hashVal = cursor.value() if cursor.set_key(hashKey) else False
+                    if hashVal is False:
+                        break
+                    hashVals[hashKey] = hashVal
+        finally:
+            self.txnregister.abort_reader_txn(self.env.hashenv)
 
+        if hashVal is False:
+            msg = f'HASH DOES NOT EXIST: {hashKey}'
+            context.set_details(msg)
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            err = hangar_service_pb2.ErrorProto(code=5, message=msg)
+            yield hangar_service_pb2.FetchDataReply(error=err)
+            return
+
+        totalSize = 0
+        packer = msgpack.Packer(use_bin_type=True)
+        fetch_max_nbytes = config.get('server.grpc.fetch_max_nbytes')
+        # the reply is packed into this thread's scratch buffer, which doubles
+        # whenever the next record does not fit.
+        scratch = getattr(self._slabs, 'fetch', None)
+        if scratch is None:
+            scratch = np.empty(_FETCH_SCRATCH_MIN_NBYTES, dtype=np.uint8)
+        scratchView = memoryview(scratch)
+        # Backend reads run on one reader thread a few samples ahead of the
+        # packing below. A single thread keeps reads of this request in order
+        # and never races the lazy file handle opening done by the accessors.
+        pending = ((digest, hashVals[hashKey]) for digest, hashKey in zip(digests, hashKeys))
+        with futures.ThreadPoolExecutor(max_workers=1) as reader:
+            readahead = deque(
+                (digest, reader.submit(self._read_tensor, hashVal))
+                for digest, hashVal in islice(pending, _FETCH_READAHEAD))
+            while readahead:
+                digest, futureTensor = readahead.popleft()
+                tensor = futureTensor.result()
+                for nextDigest, nextHashVal in islice(pending, 1):
+                    readahead.append((nextDigest, reader.submit(self._read_tensor, nextHashVal)))
+
+                head = _pack_tensor_record_head(packer, digest, tensor)
+                headEnd = totalSize + len(head)
+                end = headEnd + tensor.nbytes
+                if end > scratch.nbytes:
+                    grown = np.empty(max(end, 2 * scratch.nbytes), dtype=np.uint8)
+                    grown[:totalSize] = scratch[:totalSize]
+                    scratch, scratchView = grown, memoryview(grown)
+                scratchView[totalSize:headEnd] = head
+                np.copyto(scratch[headEnd:end].view(tensor.dtype).reshape(tensor.shape), tensor)
+                totalSize = end
                 if totalSize >= fetch_max_nbytes:
-                    err = hangar_service_pb2.ErrorProto(code=0, message='OK')
-                    cIter = chunks.tensorChunkedIterator(
-                        buf=buf, uncomp_nbytes=totalSize, itemsize=tensor.itemsize,
-                        pb2_request=hangar_service_pb2.FetchDataReply, err=err)
-                    yield from cIter
-                    time.sleep(0.1)
-                    msg = 'HANGAR REQUESTED RETRY: developer enforced limit on returned '\
-                          'raw data size to prevent memory overload of user system.'
-                    context.set_details(msg)
-                    context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
-                    err = hangar_service_pb2.ErrorProto(code=8, message=msg)
-                    yield hangar_service_pb2.FetchDataReply(error=err, raw_data=b'')
-                    raise StopIteration()
-
-        except StopIteration:
-            totalSize = 0
+                    for _, futureTensor in readahead:
+                        futureTensor.cancel()
+                    break
+        if scratch.nbytes <= _SLAB_MAX_NBYTES:
+            self._slabs.fetch = scratch
 
-        finally:
-            # finish sending all remaining tensors if max size hash not been hit.
-            if totalSize > 0:
-                err = hangar_service_pb2.ErrorProto(code=0, message='OK')
-                cIter = chunks.tensorChunkedIterator(
-                    buf=buf,
-                    uncomp_nbytes=totalSize,
-                    itemsize=tensor.itemsize,
-                    pb2_request=hangar_service_pb2.FetchDataReply,
-                    err=err)
-                yield from cIter
-            buf.close()
-            self.txnregister.abort_reader_txn(self.env.hashenv)
+        if totalSize > 0:
+            err = hangar_service_pb2.ErrorProto(code=0, message='OK')
+            cIter = chunks.tensorChunkedIterator(
+                buf=scratchView[:totalSize],
+                uncomp_nbytes=totalSize,
+                itemsize=tensor.itemsize,
+                pb2_request=hangar_service_pb2.FetchDataReply,
+                err=err)
+            yield from cIter
+
+        if totalSize >= fetch_max_nbytes:
+            time.sleep(0.1)
+            msg = 'HANGAR REQUESTED RETRY: developer enforced limit on returned '\
+                  'raw data size to prevent memory overload of user system.'
+            context.set_details(msg)
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            err = hangar_service_pb2.ErrorProto(code=8, message=msg)
+            yield hangar_service_pb2.FetchDataReply(error=err, raw_data=b'')
 
+    @_bulk_transfer
     def PushData(self, request_iterator, context):
         """Receive compressed streams of binary data from the client.
 
@@ -353,16 +642,15 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         is. If an error is detected, no sample in the entire stream will be
         saved to disk.
         """
+        dParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 uncomp_nbytes = request.uncomp_nbytes
                 comp_nbytes = request.comp_nbytes
-                dBytes, offset = bytearray(comp_nbytes), 0
-            size = len(request.raw_data)
-            dBytes[offset: offset + size] = request.raw_data
-            offset += size
+            dParts.append(request.raw_data)
+        dBytes = b''.join(dParts)
 
-        uncompBytes = blosc.decompress(dBytes)
+        uncompBytes = self._decompress_to_slab(dBytes)
         if uncomp_nbytes != len(uncompBytes):
             msg = f'ERROR: uncomp_nbytes sent: {uncomp_nbytes} != received {comp_nbytes}'
             context.set_details(msg)
@@ -371,15 +659,14 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
             reply = hangar_service_pb2.PushDataReply(error=err)
             return reply
 
-        buff = io.BytesIO(uncompBytes)
-        unpacker = msgpack.Unpacker(
-            buff, use_list=False, raw=False, max_buffer_size=1_000_000_000)
+        unpacker = _iter_unpack(
+            uncompBytes, use_list=False, raw=False, max_buffer_size=1_000_000_000)
         # hashTxn = self.txnregister.begin_writer_txn(self.env.hashenv)
-        received_data = []
-        for data in unpacker:
-            digest, schema_hash, dShape, dTypeN, dBytes = data
-            tensor = np.frombuffer(dBytes, dtype=np.typeDict[dTypeN]).reshape(dShape)
-            received_hash = hashlib.blake2b(tensor.tobytes(), digest_size=20).hexdigest()
+        records = list(unpacker)
+        # the received bytes of each sample are identical to `tensor.tobytes()`
+        received_hashes = _parallel_blake2b_hexdigests([rec[4] for rec in records])
+        for data, received_hash in zip(records, received_hashes):
+            digest = data[0]
             if received_hash != digest:
                 msg = f'HASH MANGLED, received: {received_hash} != expected digest: {digest}'
                 context.set_details(msg)
@@ -387,7 +674,16 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
                 err = hangar_service_pb2.ErrorProto(code=15, message=msg)
                 reply = hangar_service_pb2.PushDataReply(error=err)
                 return reply
-            received_data.append((received_hash, tensor))
+
+        # tensors are only built once every sample in the stream is verified.
+        # pushes are nearly always of one schema, so each dtype number is
+        # resolved to a dtype instance once rather than once per sample.
+        dtypes, received_data = {}, []
+        for digest, schema_hash, dShape, dTypeN, dBytes in records:
+            dtype = dtypes.get(dTypeN)
+            if dtype is None:
+                dtype = dtypes[dTypeN] = np.dtype(np.sctypeDict[dTypeN])
+            received_data.append((digest, np.frombuffer(dBytes, dtype=dtype).reshape(dShape)))
         saved_digests = self.CW.data(schema_hash, received_data)
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         reply = hangar_service_pb2.PushDataReply(error=err)
@@ -395,6 +691,7 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
     # ----------------------------- Label Data --------------------------------
 
+    @_uncompressed_response
     def FetchLabel(self, request, context):
         """Retrieve the metadata value corresponding to some particular hash digests
         """
@@ -407,18 +704,23 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         labelTxn = self.txnregister.begin_reader_txn(self.env.labelenv)
         try:
             labelVal = labelTxn.get(labelKey, default=False)
-            if labelVal is False:
-                msg = f'DOES NOT EXIST: labelval with key: {labelKey}'
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details(msg)
-                err = hangar_service_pb2.ErrorProto(code=5, message=msg)
-            else:
-                err = hangar_service_pb2.ErrorProto(code=0, message='OK')
-                compLabelVal = blosc.compress(labelVal)
-                reply.blob = compLabelVal
         finally:
             self.txnregister.abort_reader_txn(self.env.labelenv)
 
+        if labelVal is False:
+            msg = f'DOES NOT EXIST: labelval with key: {labelKey}'
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(msg)
+            err = hangar_service_pb2.ErrorProto(code=5, message=msg)
+        else:
+            err = hangar_service_pb2.ErrorProto(code=0, message='OK')
+            if len(labelVal) < _LABEL_COMPRESS_MIN_NBYTES:
+                compLabelVal = blosc.compress(labelVal, typesize=1, clevel=0)
+            else:
+                compLabelVal = blosc.compress(
+                    labelVal, typesize=1, clevel=3, cname='zstd', shuffle=blosc.NOSHUFFLE)
+            reply.blob = compLabelVal
+
         reply.error.CopyFrom(err)
         return reply
 
@@ -430,7 +732,8 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         """
         req_digest = request.rec.digest
 
-        uncompBlob = blosc.decompress(request.blob)
+        # hashed and written to the db straight from the decompression slab
+        uncompBlob = self._decompress_to_slab(request.blob)
         received_hash = hashlib.blake2b(uncompBlob, digest_size=20).hexdigest()
         if received_hash != req_digest:
             msg = f'HASH MANGED: received_hash: {received_hash} != digest: {req_digest}'
@@ -453,6 +756,7 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
     # ------------------------ Fetch Find Missing -----------------------------------
 
+    @_gzip_response
     def FetchFindMissingCommits(self, request, context):
         """Determine commit digests existing on the server which are not present on the client.
         """
@@ -487,6 +791,7 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
         return reply
 
+    @_gzip_response
     def PushFindMissingCommits(self, request, context):
         """Determine commit digests existing on the client which are not present on the server.
         """
@@ -510,115 +815,99 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
 
         return reply
 
+    @_uncompressed_response
     def FetchFindMissingHashRecords(self, request_iterator, context):
         """Determine data tensor hash records existing on the server and not on the client.
         """
+        hParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 commit = request.commit
-                hBytes, offset = bytearray(request.total_byte_size), 0
-            size = len(request.hashs)
-            hBytes[offset: offset + size] = request.hashs
-            offset += size
+            hParts.append(request.hashs)
+        hBytes = b''.join(hParts)
 
-        uncompBytes = blosc.decompress(hBytes)
+        uncompBytes = self._decompress_to_slab(hBytes)
         c_hashset = set(msgpack.unpackb(uncompBytes, raw=False, use_list=False))
 
-        with tempfile.TemporaryDirectory() as tempD:
-            tmpDF = os.path.join(tempD, 'test.lmdb')
-            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
-            commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
-            s_hashes_schemas = queries.RecordQuery(tmpDB).data_hash_to_schema_hash()
-            s_hashes = set(s_hashes_schemas.keys())
-            tmpDB.close()
+        s_hashes_schemas = self._commit_queries(commit).data_hash_to_schema_hash
 
-        c_missing = list(s_hashes.difference(c_hashset))
-        c_hash_schemas = [(c_mis, s_hashes_schemas[c_mis]) for c_mis in c_missing]
+        c_hash_schemas = [(s_hash, s_schema) for s_hash, s_schema in s_hashes_schemas.items()
+                          if s_hash not in c_hashset]
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         response_pb = hangar_service_pb2.FindMissingHashRecordsReply
         cIter = chunks.missingHashIterator(commit, c_hash_schemas, err, response_pb)
         yield from cIter
 
+    @_uncompressed_response
     def PushFindMissingHashRecords(self, request_iterator, context):
         """Determine data tensor hash records existing on the client and not on the server.
         """
+        hParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 commit = request.commit
-                hBytes, offset = bytearray(request.total_byte_size), 0
-            size = len(request.hashs)
-            hBytes[offset: offset + size] = request.hashs
-            offset += size
+            hParts.append(request.hashs)
+        hBytes = b''.join(hParts)
 
-        uncompBytes = blosc.decompress(hBytes)
-        c_hashset = set(msgpack.unpackb(uncompBytes, raw=False, use_list=False))
+        uncompBytes = self._decompress_to_slab(hBytes)
+        c_hashes = msgpack.unpackb(uncompBytes, raw=False, use_list=False)
         s_hashset = set(hashs.HashQuery(self.env.hashenv).list_all_hash_keys_raw())
-        s_missing = list(c_hashset.difference(s_hashset))
+        s_missing = [c_hash for c_hash in c_hashes if c_hash not in s_hashset]
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         response_pb = hangar_service_pb2.FindMissingHashRecordsReply
         cIter = chunks.missingHashIterator(commit, s_missing, err, response_pb)
         yield from cIter
 
+    @_uncompressed_response
     def FetchFindMissingLabels(self, request_iterator, context):
         """Determine metadata hash digest records existing on the server and not on the client.
       """''
+        hParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 commit = request.commit
-                hBytes, offset = bytearray(request.total_byte_size), 0
-            size = len(request.hashs)
-            hBytes[offset: offset + size] = request.hashs
-            offset += size
-        uncompBytes = blosc.decompress(hBytes)
-        c_hashset = set(msgpack.unpackb(uncompBytes, raw=False, use_list=False))
+            hParts.append(request.hashs)
+        hBytes = b''.join(hParts)
+        uncompBytes = self._decompress_to_slab(hBytes)
+        c_hashes = msgpack.unpackb(uncompBytes, raw=False, use_list=False)
 
-        with tempfile.TemporaryDirectory() as tempD:
-            tmpDF = os.path.join(tempD, 'test.lmdb')
-            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
-            commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
-            s_hashes = set(queries.RecordQuery(tmpDB).metadata_hashes())
-            tmpDB.close()
+        s_hashes = self._commit_queries(commit).metadata_hashes
 
-        c_missing = list(s_hashes.difference(c_hashset))
+        c_missing = list(s_hashes.difference(c_hashes))
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         response_pb = hangar_service_pb2.FindMissingLabelsReply
         cIter = chunks.missingHashIterator(commit, c_missing, err, response_pb)
         yield from cIter
 
+    @_uncompressed_response
     def PushFindMissingLabels(self, request_iterator, context):
         """Determine metadata hash digest records existing on the client and not on the server.
         """
+        hParts = []
         for idx, request in enumerate(request_iterator):
             if idx == 0:
                 commit = request.commit
-                hBytes, offset = bytearray(request.total_byte_size), 0
-            size = len(request.hashs)
-            hBytes[offset: offset + size] = request.hashs
-            offset += size
-        uncompBytes = blosc.decompress(hBytes)
-        c_hashset = set(msgpack.unpackb(uncompBytes, raw=False, use_list=True))
-        s_hash_keys = list(hashs.HashQuery(self.env.labelenv).list_all_hash_keys_db())
-        s_hashes = map(parsing.hash_meta_raw_key_from_db_key, s_hash_keys)
-        s_hashset = set(s_hashes)
-
-        s_missing = list(c_hashset.difference(s_hashset))
+            hParts.append(request.hashs)
+        hBytes = b''.join(hParts)
+        uncompBytes = self._decompress_to_slab(hBytes)
+        c_hashes = msgpack.unpackb(uncompBytes, raw=False, use_list=False)
+        s_hash_keys = hashs.HashQuery(self.env.labelenv).list_all_hash_keys_db()
+        s_hashset = set(parsing.hash_meta_raw_keys_from_db_keys(s_hash_keys))
+
+        s_missing = [c_hash for c_hash in c_hashes if c_hash not in s_hashset]
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         response_pb = hangar_service_pb2.FindMissingLabelsReply
         cIter = chunks.missingHashIterator(commit, s_missing, err, response_pb)
         yield from cIter
 
+    @_gzip_response
     def FetchFindMissingSchemas(self, request, context):
         """Determine schema hash digest records existing on the server and not on the client.
         """
         commit = request.commit
-        c_schemas = set(request.schema_digests)
+        c_schemas = request.schema_digests
 
-        with tempfile.TemporaryDirectory() as tempD:
-            tmpDF = os.path.join(tempD, 'test.lmdb')
-            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
-            commiting.unpack_commit_ref(self.env.refenv, tmpDB, commit)
-            s_schemas = set(queries.RecordQuery(tmpDB).schema_hashes())
-            tmpDB.close()
+        s_schemas = self._commit_queries(commit).schema_hashes
 
         c_missing = list(s_schemas.difference(c_schemas))
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
@@ -626,13 +915,14 @@ class HangarServer(hangar_service_pb2_grpc.HangarServiceServicer):
         reply.schema_digests.extend(c_missing)
         return reply
 
+    @_gzip_response
     def PushFindMissingSchemas(self, request, context):
         """Determine schema hash digest records existing on the client and not on the server.
         """
         commit = request.commit
-        c_schemas = set(request.schema_digests)
+        c_schemas = request.schema_digests
         s_schemas = set(hashs.HashQuery(self.env.hashenv).list_all_schema_keys_raw())
-        s_missing = list(c_schemas.difference(s_schemas))
+        s_missing = [c_schema for c_schema in c_schemas if c_schema not in s_schemas]
 
         err = hangar_service_pb2.ErrorProto(code=0, message='OK')
         reply = hangar_service_pb2.FindMissingSchemasReply(commit=commit, error=err)
@@ -660,41 +950,79 @@ def serve(hangar_path: os.PathLike,
     config.ensure_file(src_path, destination=dest_path, comment=False)
     config.refresh(paths=[dest_path])
 
-    enable_compression = config.get('server.grpc.enable_compression')
-    optimization_target = config.get('server.grpc.optimization_target')
+    grpc_cfg = config.get('server.grpc')
+    enable_compression = grpc_cfg['enable_compression']
+    optimization_target = grpc_cfg['optimization_target']
     if channel_address is None:
-        channel_address = config.get('server.grpc.channel_address')
-    max_thread_pool_workers = config.get('server.grpc.max_thread_pool_workers')
-    max_concurrent_rpcs = config.get('server.grpc.max_concurrent_rpcs')
+        channel_address = grpc_cfg['channel_address']
+    max_thread_pool_workers = grpc_cfg['max_thread_pool_workers']
+    if max_thread_pool_workers is None:
+        max_thread_pool_workers = min(32, (os.cpu_count() or 1) * 2)
+    # containers often see every host core; allow capping threads independently.
+    max_thread_pool_workers = int(os.environ.get('HANGAR_GRPC_MAX_THREADS', max_thread_pool_workers))
+    max_concurrent_rpcs = grpc_cfg['max_concurrent_rpcs']
+    # optional; server dirs configured before it existed do not list it.
+    max_executing_rpcs = grpc_cfg.get('max_executing_rpcs')
 
     if (restrict_push is None) and (username is None) and (password is None):
-        admin_restrict_push = config.get('server.admin.restrict_push')
-        admin_username = config.get('server.admin.username')
-        admin_password = config.get('server.admin.password')
+        admin_cfg = config.get('server.admin')
+        admin_restrict_push = admin_cfg['restrict_push']
+        admin_username = admin_cfg['username']
+        admin_password = admin_cfg['password']
     else:
         admin_restrict_push = restrict_push
         admin_username = username
         admin_password = password
-    msg = 'PERMISSION ERROR: PUSH OPERATIONS RESTRICTED FOR CALLER'
-    code = grpc.StatusCode.PERMISSION_DENIED
-    interc = request_header_validator_interceptor.RequestHeaderValidatorInterceptor(
-        admin_restrict_push, admin_username, admin_password, code, msg)
+    interceptors = []
+    # the validator passes every call through unless pushes are restricted.
+    if admin_restrict_push is True:
+        msg = 'PERMISSION ERROR: PUSH OPERATIONS RESTRICTED FOR CALLER'
+        code = grpc.StatusCode.PERMISSION_DENIED
+        interceptors.append(request_header_validator_interceptor.RequestHeaderValidatorInterceptor(
+            admin_restrict_push, admin_username, admin_password, code, msg))
+
+    # deflate trades CPU for bytes on the wire; worthwhile on slow links only,
+    # as the bulk payloads are already blosc compressed.
+    compression = grpc.Compression.Deflate if enable_compression else grpc.Compression.NoCompression
 
     # ---------------- Start the thread pool for the grpc server --------------
 
-    grpc_thread_pool = futures.ThreadPoolExecutor(
-        max_workers=max_thread_pool_workers,
-        thread_name_prefix='grpc_thread_pool')
+    if max_executing_rpcs is None:
+        grpc_thread_pool = futures.ThreadPoolExecutor(
+            max_workers=max_thread_pool_workers,
+            thread_name_prefix='grpc_thread_pool')
+    else:
+        # rejections need a free thread to run on, and grpc rejects calls over
+        # max_concurrent_rpcs itself before ours would.
+        if max_executing_rpcs >= max_thread_pool_workers:
+            raise ValueError(
+                f'server.grpc.max_executing_rpcs ({max_executing_rpcs}) must be less than '
+                f'the grpc thread pool size ({max_thread_pool_workers})')
+        if (max_concurrent_rpcs is not None) and (max_executing_rpcs >= max_concurrent_rpcs):
+            raise ValueError(
+                f'server.grpc.max_executing_rpcs ({max_executing_rpcs}) must be less than '
+                f'server.grpc.max_concurrent_rpcs ({max_concurrent_rpcs})')
+        grpc_thread_pool = concurrency_limit_interceptor.AdmissionCountingThreadPool(
+            max_workers=max_thread_pool_workers,
+            thread_name_prefix='grpc_thread_pool')
+        interceptors.append(concurrency_limit_interceptor.ConcurrencyLimitInterceptor(
+            max_executing_rpcs, grpc_thread_pool))
     server = grpc.server(
         thread_pool=grpc_thread_pool,
         maximum_concurrent_rpcs=max_concurrent_rpcs,
-        options=[('grpc.default_compression_algorithm', enable_compression),
-                 ('grpc.optimization_target', optimization_target)],
-        interceptors=(interc,))
+        options=[('grpc.default_compression_algorithm', compression.value),
+                 ('grpc.compression_enabled_algorithms_bitset', _GRPC_COMPRESSION_ALGORITHMS),
+                 ('grpc.optimization_target', optimization_target),
+                 ('grpc.max_send_message_length', c.GRPC_MAX_MESSAGE_NBYTES),
+                 ('grpc.max_receive_message_length', c.GRPC_MAX_MESSAGE_NBYTES),
+                 ('grpc.keepalive_time_ms', 30_000),
+                 ('grpc.keepalive_timeout_ms', 10_000)],
+        interceptors=interceptors)
 
     # ------------------- Start the GRPC server -------------------------------
 
-    hangserv = HangarServer(dest_path, overwrite)
+    hangserv = HangarServer(dest_path, overwrite,
+                            max_bulk_transfers=_bulk_transfer_slots(max_thread_pool_workers))
     hangar_service_pb2_grpc.add_HangarServiceServicer_to_server(hangserv, server)
     server.add_insecure_port(channel_address)
     return (server, hangserv, channel_address)
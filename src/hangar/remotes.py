@@ -22,6 +22,31 @@ logger = logging.getLogger(__name__)
 
 RemoteInfo = NamedTuple('RemoteInfo', [('name', str), ('address', str)])
 
+# a server with every bulk transfer slot taken (or over its rpc limit) answers
+# with UNAVAILABLE; the data transfer is retried after an exponential back-off.
+_BUSY_RETRY_ATTEMPTS = 6
+_BUSY_RETRY_DELAY = 0.25
+
+
+def _retry_while_server_busy(func, *args, **kwargs):
+    """Call ``func``, retrying with back-off while the server reports it is busy.
+
+    Raises
+    ------
+    grpc.RpcError
+        any other rpc error, or ``UNAVAILABLE`` once every attempt was refused.
+    """
+    delay = _BUSY_RETRY_DELAY
+    for attempt in range(1, _BUSY_RETRY_ATTEMPTS + 1):
+        try:
+            return func(*args, **kwargs)
+        except grpc.RpcError as rpc_error:
+            if (rpc_error.code() != grpc.StatusCode.UNAVAILABLE) or (attempt == _BUSY_RETRY_ATTEMPTS):
+                raise rpc_error
+            logger.info(f'{rpc_error.details()}: retrying in {delay} seconds')
+            time.sleep(delay)
+            delay *= 2
+
 
 class Remotes(object):
 
@@ -344,7 +369,7 @@ class Remotes(object):
         with tempfile.TemporaryDirectory() as tempD:
             # share unpacked ref db between dependent methods
             tmpDF = os.path.join(tempD, 'test.lmdb')
-            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+            tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
             try:
                 allHashs = set()
                 # all history argument
@@ -387,7 +412,7 @@ class Remotes(object):
             for schema in m_schema_hash_map.keys():
                 hashes = set(m_schema_hash_map[schema])
                 while (len(hashes) > 0) and (not stop):
-                    ret = client.fetch_data(schema, hashes)
+                    ret = _retry_while_server_busy(client.fetch_data, schema, hashes)
                     # max_num_bytes option
                     if isinstance(max_num_bytes, int):
                         for idx, r_kv in enumerate(ret):
@@ -490,7 +515,7 @@ class Remotes(object):
             m_schema_hashs = defaultdict(set)
             with tempfile.TemporaryDirectory() as tempD:
                 tmpDF = os.path.join(tempD, 'test.lmdb')
-                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_SETTINGS)
+                tmpDB = lmdb.open(path=tmpDF, **c.LMDB_TMP_SETTINGS)
                 for commit in tqdm(m_commits, desc='counting objects'):
                     # share unpacked ref db between dependent methods
                     with tmpDB.begin(write=True) as txn:
@@ -526,7 +551,7 @@ class Remotes(object):
             total_data = sum([len(v) for v in m_schema_hashs.values()])
             with tqdm(total=total_data, desc='pushing data') as p:
                 for dataSchema, dataHashes in m_schema_hashs.items():
-                    client.push_data(dataSchema, dataHashes, pbar=p)
+                    _retry_while_server_busy(client.push_data, dataSchema, dataHashes, pbar=p)
                     p.update(1)
             # labels/metadata
             for label in tqdm(m_labels, desc='pushing metadata'):
@@ -1,16 +1,29 @@
 import os
+import re
 import weakref
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Union, Optional, List
 
-from . import merger
 from . import constants as c
 from .remotes import Remotes
-from .context import Environments
-from .diagnostics import graphing, ecosystem
+from .context import Environments, TxnRegister
 from .records import heads, parsing, summarize, vcompat
 from .checkout import ReaderCheckout, WriterCheckout
-from .utils import is_valid_directory_path, is_suitable_user_key, is_ascii
+from .utils import is_valid_directory_path
+
+
+@lru_cache(maxsize=128)
+def _hangar_dir(usr_path: str) -> str:
+    return os.path.join(usr_path, c.DIR_HANGAR)
+
+
+_BRANCH_KEY_RE = re.compile(r'^[A-Za-z0-9._-]+$')
+
+_PRETTY_TMPL = ('Hangar {cls}'
+                '\n    Repository Path  : {path}'
+                '\n    Writer-Lock Free : {lock}\n')
 
 
 class Repository(object):
@@ -50,7 +63,7 @@ class Repository(object):
         except (TypeError, NotADirectoryError, PermissionError) as e:
             raise e from None
 
-        repo_pth = os.path.join(usr_path, c.DIR_HANGAR)
+        repo_pth = _hangar_dir(usr_path)
         if exists is False:
             with warnings.catch_warnings():
                 warnings.simplefilter('ignore', UserWarning)
@@ -59,8 +72,12 @@ class Repository(object):
             envs = Environments(pth=repo_pth)
 
         self._repo_path: os.PathLike = repo_pth
+        self._user_repo_path: os.PathLike = os.path.dirname(repo_pth)
         self._env: Environments = envs
         self._remote: Remotes = Remotes(self._env)
+        self._remote_proxy: Remotes = weakref.proxy(self._remote)
+        self._branch_query_cache = {}
+        self._initialized: bool = self._env.repo_is_initialized
 
     def _repr_pretty_(self, p, cycle):
         """provide a pretty-printed repr for ipython based user interaction.
@@ -76,10 +93,10 @@ class Repository(object):
 
         """
         self.__verify_repo_initialized()
-        res = f'Hangar {self.__class__.__name__}\
-               \n    Repository Path  : {self.path}\
-               \n    Writer-Lock Free : {heads.writer_lock_held(self._env.branchenv)}\n'
-        p.text(res)
+        p.text(_PRETTY_TMPL.format(
+            cls=self.__class__.__name__,
+            path=self._user_repo_path,
+            lock=self._cached_branch_query(heads.writer_lock_held)))
 
     def __repr__(self):
         """Override the default repr to show useful information to developers.
@@ -99,6 +116,32 @@ class Repository(object):
         res = f'{self.__class__}(path={self._repo_path})'
         return res
 
+    def _cached_branch_query(self, query):
+        """Run a read-only query against the branch db, reusing the last result
+        until something is next written to it.
+
+        Any committed write txn (in this or any other process) advances the
+        environment's ``last_txnid``, so cached results are never stale.
+
+        Parameters
+        ----------
+        query : Callable[[lmdb.Environment], Any]
+            one of the :mod:`heads` functions only taking the branch env.
+
+        Returns
+        -------
+        Any
+            result of the query, which must not be mutated by the caller.
+        """
+        branchenv = self._env.branchenv
+        txnid = branchenv.info()['last_txnid']
+        hit = self._branch_query_cache.get(query)
+        if hit is not None and hit[0] is branchenv and hit[1] == txnid:
+            return hit[2]
+        res = query(branchenv)
+        self._branch_query_cache[query] = (branchenv, txnid, res)
+        return res
+
     def __verify_repo_initialized(self):
         """Internal method to verify repo initialized before operations occur
 
@@ -108,7 +151,12 @@ class Repository(object):
             If the repository db environments have not been initialized at the
             specified repo path.
         """
-        if not self._env.repo_is_initialized:
+        if self._initialized:
+            return
+        # a repo can only go from uninitialized -> initialized (via `init()`),
+        # so the env needs to be consulted again only until that happens once.
+        self._initialized = self._env.repo_is_initialized
+        if not self._initialized:
             msg = f'Repository at path: {self._repo_path} has not been initialized. '\
                   f'Please run the `init_repo()` function'
             raise RuntimeError(msg)
@@ -126,8 +174,7 @@ class Repository(object):
         Remotes
             Accessor object methods for controlling remote interactions.
         """
-        proxy = weakref.proxy(self._remote)
-        return proxy
+        return self._remote_proxy
 
     @property
     def path(self) -> os.PathLike:
@@ -139,7 +186,7 @@ class Repository(object):
             path to the specified repository, not including `.hangar` directory
         """
         self.__verify_repo_initialized()
-        return os.path.dirname(self._repo_path)
+        return self._user_repo_path
 
     @property
     def writer_lock_held(self) -> bool:
@@ -151,7 +198,7 @@ class Repository(object):
             True is writer-lock is held, False if writer-lock is free.
         """
         self.__verify_repo_initialized()
-        return not heads.writer_lock_held(self._env.branchenv)
+        return not self._cached_branch_query(heads.writer_lock_held)
 
     @property
     def version(self) -> str:
@@ -216,32 +263,32 @@ class Repository(object):
             data
         """
         self.__verify_repo_initialized()
+        if not isinstance(write, bool):
+            raise ValueError("Argument `write` only takes True or False as value")
+        env = self._env
         try:
-            if write is True:
+            if write:
                 co = WriterCheckout(
                     repo_pth=self._repo_path,
                     branch_name=branch,
-                    labelenv=self._env.labelenv,
-                    hashenv=self._env.hashenv,
-                    refenv=self._env.refenv,
-                    stageenv=self._env.stageenv,
-                    branchenv=self._env.branchenv,
-                    stagehashenv=self._env.stagehashenv)
-                return co
-            elif write is False:
-                commit_hash = self._env.checkout_commit(
+                    labelenv=env.labelenv,
+                    hashenv=env.hashenv,
+                    refenv=env.refenv,
+                    stageenv=env.stageenv,
+                    branchenv=env.branchenv,
+                    stagehashenv=env.stagehashenv)
+            else:
+                commit_hash = env.checkout_commit(
                     branch_name=branch, commit=commit)
                 co = ReaderCheckout(
                     base_path=self._repo_path,
-                    labelenv=self._env.labelenv,
-                    dataenv=self._env.cmtenv[commit_hash],
-                    hashenv=self._env.hashenv,
-                    branchenv=self._env.branchenv,
-                    refenv=self._env.refenv,
+                    labelenv=env.labelenv,
+                    dataenv=env.cmtenv[commit_hash],
+                    hashenv=env.hashenv,
+                    branchenv=env.branchenv,
+                    refenv=env.refenv,
                     commit=commit_hash)
-                return co
-            else:
-                raise ValueError("Argument `write` only takes True or False as value")
+            return co
         except (RuntimeError, ValueError) as e:
             raise e from None
 
@@ -285,8 +332,9 @@ class Repository(object):
         self.init(user_name=user_name, user_email=user_email, repo_desc=repo_desc, remove_old=remove_old)
         self._remote.add(name='origin', address=remote_address)
         branch = self._remote.fetch(remote='origin', branch='master')
-        HEAD = heads.get_branch_head_commit(self._env.branchenv, branch_name=branch)
-        heads.set_branch_head_commit(self._env.branchenv, 'master', HEAD)
+        env = self._env
+        HEAD = heads.get_branch_head_commit(env.branchenv, branch_name=branch)
+        heads.set_branch_head_commit(env.branchenv, 'master', HEAD)
         with warnings.catch_warnings(record=False):
             warnings.simplefilter('ignore', category=UserWarning)
             co = self.checkout(write=True, branch='master')
@@ -363,12 +411,24 @@ class Repository(object):
             Dict containing the commit ancestor graph, and all specifications.
         """
         self.__verify_repo_initialized()
-        res = summarize.list_history(
-            refenv=self._env.refenv,
-            branchenv=self._env.branchenv,
-            branch_name=branch,
-            commit_hash=commit)
-        branchMap = dict(heads.commit_hash_to_branch_name_map(branchenv=self._env.branchenv))
+        env = self._env
+        # hold one reader txn per env open across the traversal; the per-commit
+        # and per-branch lookups made by the helpers reuse it from the register.
+        txnreg = TxnRegister()
+        txnreg.begin_reader_txn(env.refenv)
+        txnreg.begin_reader_txn(env.branchenv)
+        try:
+            res = summarize.list_history(
+                refenv=env.refenv,
+                branchenv=env.branchenv,
+                branch_name=branch,
+                commit_hash=commit)
+            cachedMap = self._cached_branch_query(heads.commit_hash_to_branch_name_map)
+            # the cached map is shared between calls; hand out copies of its lists.
+            branchMap = {digest: list(names) for digest, names in cachedMap.items()}
+        finally:
+            txnreg.abort_reader_txn(env.branchenv)
+            txnreg.abort_reader_txn(env.refenv)
 
         if return_contents:
             for digest in list(branchMap.keys()):
@@ -377,6 +437,7 @@ class Repository(object):
             res['branch_heads'] = branchMap
             return res
         else:
+            from .diagnostics import graphing
             g = graphing.Graph()
             g.show_nodes(dag=res['ancestors'],
                          spec=res['specs'],
@@ -406,19 +467,20 @@ class Repository(object):
     def _details(self) -> None:  # pragma: no cover
         """DEVELOPER USE ONLY: Dump some details about the underlying db structure to disk.
         """
-        print(summarize.details(self._env.branchenv).getvalue())
-        print(summarize.details(self._env.refenv).getvalue())
-        print(summarize.details(self._env.hashenv).getvalue())
-        print(summarize.details(self._env.labelenv).getvalue())
-        print(summarize.details(self._env.stageenv).getvalue())
-        print(summarize.details(self._env.stagehashenv).getvalue())
-        for commit, commitenv in self._env.cmtenv.items():
-            print(summarize.details(commitenv).getvalue())
+        envs = [self._env.branchenv, self._env.refenv, self._env.hashenv,
+                self._env.labelenv, self._env.stageenv, self._env.stagehashenv,
+                *self._env.cmtenv.values()]
+        # each env is dumped in its own txn, so they can be read concurrently;
+        # map() keeps the output in the order listed above.
+        with ThreadPoolExecutor(max_workers=min(8, len(envs))) as ex:
+            for buf in ex.map(summarize.details, envs):
+                print(buf.getvalue())
         return
 
     def _ecosystem_details(self) -> dict:
         """DEVELOPER USER ONLY: log and return package versions on the system.
         """
+        from .diagnostics import ecosystem
         eco = ecosystem.get_versions()
         return eco
 
@@ -439,13 +501,16 @@ class Repository(object):
         str
             Hash of the commit which is written if possible.
         """
+        from . import merger
+
         self.__verify_repo_initialized()
+        env = self._env
         commit_hash = merger.select_merge_algorithm(
             message=message,
-            branchenv=self._env.branchenv,
-            stageenv=self._env.stageenv,
-            refenv=self._env.refenv,
-            stagehashenv=self._env.stagehashenv,
+            branchenv=env.branchenv,
+            stageenv=env.stageenv,
+            refenv=env.refenv,
+            stagehashenv=env.stagehashenv,
             master_branch=master_branch,
             dev_branch=dev_branch,
             repo_path=self._repo_path)
@@ -506,7 +571,7 @@ class Repository(object):
             (ie. `master`) branch.
         """
         self.__verify_repo_initialized()
-        if (not is_ascii(name)) or (not is_suitable_user_key(name)):
+        if not (isinstance(name, str) and _BRANCH_KEY_RE.match(name)):
             e = ValueError(f'Branch name provided: {name} invalid. Must contain '
                            f'only alpha-numeric or "." "_" "-" ascii characters.')
             raise e from None
@@ -630,8 +695,9 @@ class Repository(object):
             and ``force_delete`` option is not ``True``.
         """
         self.__verify_repo_initialized()
-        res = heads.remove_branch(branchenv=self._env.branchenv,
-                                  refenv=self._env.refenv,
+        env = self._env
+        res = heads.remove_branch(branchenv=env.branchenv,
+                                  refenv=env.refenv,
                                   name=name,
                                   force_delete=force_delete)
         return res
@@ -645,8 +711,8 @@ class Repository(object):
             the branch names recorded in the repository
         """
         self.__verify_repo_initialized()
-        branches = heads.get_branch_names(self._env.branchenv)
-        return branches
+        branches = self._cached_branch_query(heads.get_branch_names)
+        return list(branches)
 
     def force_release_writer_lock(self) -> bool:
         """Force release the lock left behind by an unclosed writer-checkout
@@ -61,7 +61,7 @@ def generate_3_images(managed_tmpdir):
 @pytest.fixture()
 def repo(managed_tmpdir) -> Repository:
     repo_obj = Repository(path=managed_tmpdir, exists=False)
-    repo_obj.init(user_name='tester', user_email='foo@test.bar', remove_old=True)
+    repo_obj.init(user_name='tester', user_email='foo@test.bar', repo_desc='test repo', remove_old=True)
     yield repo_obj
     repo_obj._env._close_environments()
 
@@ -212,6 +212,26 @@ def server_instance(managed_tmpdir, worker_id):
         time.sleep(0.3)
 
 
+@pytest.fixture()
+def server_instance_and_hangserver(managed_tmpdir, worker_id):
+    """like ``server_instance``, also yielding the servicer for inspection"""
+    from hangar import serve
+
+    address = f'localhost:{randint(50000, 59999)}'
+    base_tmpdir = pjoin(managed_tmpdir, f'{worker_id[-1]}')
+    mkdir(base_tmpdir)
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+    yield (address, hangserver)
+
+    hangserver.env._close_environments()
+    server.stop(0.1)
+    time.sleep(0.2)
+    if platform.system() == 'Windows':
+        # time for open file handles to close before tmp dir can be removed.
+        time.sleep(0.3)
+
+
 @pytest.fixture()
 def server_instance_push_restricted(managed_tmpdir, worker_id):
     from hangar import serve
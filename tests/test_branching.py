@@ -222,8 +222,44 @@ def test_delete_branch_raises_permission_error_if_only_one_branch_left(written_r
     masterHEAD = co.commit('second')
     co.close()
 
-
     assert repo.list_branches() == ['master']
     with pytest.raises(PermissionError):
         repo.remove_branch('master')
-    assert repo.list_branches() == ['master']
\ No newline at end of file
+    assert repo.list_branches() == ['master']
+
+
+def test_list_branches_cache_sees_created_and_removed_branches(written_repo):
+    repo = written_repo
+    assert repo.list_branches() == ['master']
+    # second call is answered from the cache primed above.
+    assert repo.list_branches() == ['master']
+
+    repo.create_branch('testcache')
+    assert repo.list_branches() == ['master', 'testcache']
+    repo.create_branch('testcache2')
+    assert repo.list_branches() == ['master', 'testcache', 'testcache2']
+
+    repo.remove_branch('testcache')
+    assert repo.list_branches() == ['master', 'testcache2']
+    repo.remove_branch('testcache2')
+    assert repo.list_branches() == ['master']
+
+
+def test_writer_lock_held_cache_follows_checkout(written_repo):
+    repo = written_repo
+    assert repo.writer_lock_held is False
+    co = repo.checkout(write=True)
+    assert repo.writer_lock_held is True
+    co.close()
+    assert repo.writer_lock_held is False
+
+
+def test_log_branch_heads_are_not_shared_with_the_cache(written_repo):
+    repo = written_repo
+    repo.create_branch('testbranch')
+    heads = repo.log(return_contents=True)['branch_heads']
+    for names in heads.values():
+        names.append('mutated')
+
+    heads = repo.log(return_contents=True)['branch_heads']
+    assert sorted(name for names in heads.values() for name in names) == ['master', 'testbranch']
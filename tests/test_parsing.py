@@ -0,0 +1,266 @@
+import json
+
+import numpy as np
+import pytest
+
+
+def _legacy_commit_spec_db_val(spec_dict):
+    """commit spec value as written by hangar < 0.4.0"""
+    import blosc
+
+    db_spec_val = json.dumps(spec_dict, separators=(',', ':')).encode()
+    comp_raw = blosc.compress(
+        db_spec_val, typesize=8, clevel=9, shuffle=blosc.SHUFFLE, cname='zlib')
+    return db_spec_val, comp_raw
+
+
+def test_commit_spec_round_trip():
+    from hangar.records.parsing import commit_spec_db_val_from_raw_val
+    from hangar.records.parsing import commit_spec_raw_val_from_db_val
+
+    spec = (1568000000.123, 'a message', 'test user', 'test@email.com')
+    db_spec = commit_spec_db_val_from_raw_val(*spec)
+    assert db_spec.raw[:1] == b'\xc1'
+
+    res = commit_spec_raw_val_from_db_val(db_spec.raw)
+    assert res.digest == db_spec.digest
+    assert tuple(res.user_spec) == spec
+
+
+def test_commit_spec_reads_legacy_blosc_json():
+    from hangar.records.parsing import _hash_func
+    from hangar.records.parsing import commit_spec_raw_val_from_db_val
+
+    spec_dict = {
+        'commit_time': 1568000000.123,
+        'commit_message': 'a message',
+        'commit_user': 'test user',
+        'commit_email': 'test@email.com',
+    }
+    uncomp, db_val = _legacy_commit_spec_db_val(spec_dict)
+
+    res = commit_spec_raw_val_from_db_val(db_val)
+    assert res.digest == _hash_func(uncomp)
+    assert res.user_spec._asdict() == spec_dict
+
+
+def test_commit_spec_unknown_format_revision_raises():
+    from hangar.records.parsing import commit_spec_db_val_from_raw_val
+    from hangar.records.parsing import commit_spec_raw_val_from_db_val
+
+    db_spec = commit_spec_db_val_from_raw_val(1.0, 'msg', 'user', 'e@mail.com')
+    future_val = b'\xc1\xff' + db_spec.raw[2:]
+    with pytest.raises(ValueError, match='newer release'):
+        commit_spec_raw_val_from_db_val(future_val)
+
+
+@pytest.mark.parametrize('reader,writer,expected', [
+    ['0.3.0', '0.3.0', True],
+    ['0.4.0', '0.3.0', True],
+    ['0.4.0', '0.4.0', True],
+    ['0.5.2', '0.4.0', True],
+    ['0.3.0', '0.4.0', False],
+    ['0.3.9', '0.5.0', False],
+])
+def test_can_read_records_written_by(reader, writer, expected):
+    from hangar.records.parsing import repo_version_raw_spec_from_raw_string as to_spec
+    from hangar.records.vcompat import can_read_records_written_by
+
+    assert can_read_records_written_by(to_spec(reader), to_spec(writer)) is expected
+
+
+def test_opening_repo_does_not_write_record_format(managed_tmpdir):
+    from hangar import Repository
+    from hangar.records import vcompat
+    from hangar.records.parsing import VersionSpec
+
+    repo = Repository(path=managed_tmpdir, exists=False)
+    repo.init(user_name='tester', user_email='foo@test.bar', repo_desc='test repo', remove_old=True)
+    repo._env._close_environments()
+
+    repo = Repository(managed_tmpdir)
+    fmt = vcompat.get_repository_record_format_spec(repo._env.branchenv)
+    assert fmt == VersionSpec(0, 0, 0)
+    repo._env._close_environments()
+
+
+def test_first_arrayset_and_commit_mark_record_format(managed_tmpdir):
+    from hangar import Repository, __version__
+    from hangar.records import vcompat
+
+    repo = Repository(path=managed_tmpdir, exists=False)
+    repo.init(user_name='tester', user_email='foo@test.bar', repo_desc='test repo', remove_old=True)
+    branchenv = repo._env.branchenv
+    co = repo.checkout(write=True)
+    co.arraysets.init_arrayset(name='aset', shape=(5, 7), dtype=np.float64)
+    assert vcompat.get_repository_record_format_spec(branchenv) == vcompat.current_record_format
+    co.commit('first')
+    co.close()
+
+    assert vcompat.get_repository_record_format_spec(branchenv) == vcompat.current_record_format
+    assert vcompat.set_repository_record_format(branchenv) is False
+    assert repo.version == __version__
+    repo._env._close_environments()
+
+
+def test_repo_written_in_newer_record_format_is_refused(monkeypatch, written_repo):
+    from hangar import Repository
+    from hangar.records import vcompat
+    from hangar.records.parsing import VersionSpec
+
+    repo_path = written_repo.path
+    newer = VersionSpec(0, 99, 0)
+    monkeypatch.setattr(vcompat, 'record_format_changes', [*vcompat.record_format_changes, newer])
+    with monkeypatch.context() as m:
+        m.setattr(vcompat, 'current_record_format', newer)
+        assert vcompat.set_repository_record_format(written_repo._env.branchenv) is True
+    written_repo._env._close_environments()
+
+    with pytest.raises(RuntimeError, match='record'):
+        Repository(repo_path)
+
+
+def test_arrayset_schema_round_trip():
+    from hangar.records.parsing import arrayset_record_schema_db_val_from_raw_val
+    from hangar.records.parsing import arrayset_record_schema_raw_val_from_db_val
+
+    db_val = arrayset_record_schema_db_val_from_raw_val(
+        schema_hash='abc123', schema_is_var=True, schema_max_shape=(5, 7),
+        schema_dtype=12, schema_is_named=False, schema_default_backend='10')
+    assert db_val[:1] == b'\xc1'
+
+    res = arrayset_record_schema_raw_val_from_db_val(db_val)
+    assert res.schema_hash == 'abc123'
+    assert res.schema_is_var is True
+    assert res.schema_max_shape == (5, 7)
+    assert res.schema_dtype == 12
+    assert res.schema_is_named is False
+    assert res.schema_default_backend == '10'
+
+
+def test_arrayset_schema_reads_legacy_json_dict():
+    from hangar.records.parsing import arrayset_record_schema_raw_val_from_db_val
+
+    schema_dict = {
+        'schema_hash': 'abc123',
+        'schema_dtype': 12,
+        'schema_is_var': False,
+        'schema_max_shape': [5, 7],
+        'schema_is_named': True,
+        'schema_default_backend': '00',
+    }
+    db_val = json.dumps(schema_dict, separators=(',', ':')).encode()
+
+    res = arrayset_record_schema_raw_val_from_db_val(db_val)
+    assert res.schema_max_shape == (5, 7)
+    assert res._replace(schema_max_shape=[5, 7])._asdict() == schema_dict
+
+
+def test_arrayset_schema_unknown_format_revision_raises():
+    from hangar.records.parsing import arrayset_record_schema_raw_val_from_db_val
+
+    with pytest.raises(ValueError, match='newer release'):
+        arrayset_record_schema_raw_val_from_db_val(b'\xc1\x07["abc",12,false,[5],true,"10"]')
+
+
+@pytest.mark.parametrize('db_val', [b'', b'\xc1'])
+def test_empty_or_truncated_record_value_raises_corrupt(db_val):
+    from hangar.records.parsing import arrayset_record_schema_raw_val_from_db_val
+    from hangar.records.parsing import commit_spec_raw_val_from_db_val
+
+    with pytest.raises(ValueError, match='corrupt'):
+        commit_spec_raw_val_from_db_val(db_val)
+    with pytest.raises(ValueError, match='corrupt'):
+        arrayset_record_schema_raw_val_from_db_val(db_val)
+
+
+def test_checkout_reads_arrayset_with_legacy_schema(written_repo, array5by7):
+    from hangar.records.parsing import arrayset_record_schema_db_key_from_raw_key
+    from hangar.records.parsing import hash_schema_db_key_from_raw_key
+
+    co = written_repo.checkout(write=True)
+    schema_hash = co.arraysets['writtenaset']._default_schema_hash
+    co.arraysets['writtenaset']['0'] = array5by7
+    co.close()
+
+    legacy_val = json.dumps({
+        'schema_hash': schema_hash,
+        'schema_dtype': array5by7.dtype.num,
+        'schema_is_var': False,
+        'schema_max_shape': list(array5by7.shape),
+        'schema_is_named': True,
+        'schema_default_backend': '00',
+    }, separators=(',', ':')).encode()
+    env = written_repo._env
+    with env.stageenv.begin(write=True) as txn:
+        txn.put(arrayset_record_schema_db_key_from_raw_key('writtenaset'), legacy_val)
+    with env.hashenv.begin(write=True) as txn:
+        txn.put(hash_schema_db_key_from_raw_key(schema_hash), legacy_val)
+
+    co = written_repo.checkout(write=True)
+    assert co.arraysets['writtenaset'].shape == array5by7.shape
+    assert np.allclose(co.arraysets['writtenaset']['0'], array5by7)
+    co.commit('commit with legacy schema')
+    co.close()
+
+    co = written_repo.checkout()
+    assert np.allclose(co.arraysets['writtenaset']['0'], array5by7)
+    co.close()
+
+
+def test_generate_sample_names_unique_across_threads_batch_and_single():
+    from concurrent.futures import ThreadPoolExecutor
+    from hangar.records.parsing import generate_sample_name, generate_sample_names
+
+    def mixed(idx):
+        names = []
+        for _ in range(50):
+            names.extend(generate_sample_names(idx + 1))
+            names.append(generate_sample_name())
+        return names
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(mixed, range(16)))
+    allNames = [name for names in results for name in names]
+    assert len(allNames) == sum(50 * (idx + 2) for idx in range(16))
+    assert len(set(allNames)) == len(allNames)
+
+
+def test_generate_sample_names_unique_past_counter_wraparound():
+    from hangar.records.parsing import NAME_COUNTER_MAX, generate_sample_names
+
+    names = generate_sample_names(NAME_COUNTER_MAX * 2 + 10)
+    assert len(set(names)) == len(names)
+
+
+def test_iter_data_records_matches_named_tuple_parsing():
+    from hangar.records import parsing
+
+    records = [('aset', 'foo', 'abc123'), ('aset', 42, 'def456'), ('other', '0', 'fff000')]
+    db_items = [(parsing.data_record_db_key_from_raw_key(aset, name),
+                 parsing.data_record_db_val_from_raw_val(digest))
+                for aset, name, digest in records]
+
+    res = list(parsing.iter_data_records(db_items))
+    assert res == [(aset, name, digest.encode()) for aset, name, digest in records]
+    for (db_key, db_val), (aset, name, digest) in zip(db_items, res):
+        rawKey = parsing.data_record_raw_key_from_db_key(db_key)
+        rawVal = parsing.data_record_raw_val_from_db_val(db_val)
+        assert (rawKey.aset_name, rawKey.data_name, rawVal.data_hash) == (aset, name, digest.decode())
+
+
+def test_record_query_arrayset_data_items_matches_data_records(written_repo, array5by7):
+    from hangar.records import queries
+
+    co = written_repo.checkout(write=True)
+    co.arraysets['writtenaset']['foo'] = array5by7
+    co.arraysets['writtenaset'][7] = array5by7 + 1
+    co.commit('str and int sample names')
+    co.close()
+
+    query = queries.RecordQuery(written_repo._env.stageenv)
+    items = list(query.arrayset_data_items('writtenaset'))
+    expected = [(k.aset_name, k.data_name, v.data_hash.encode())
+                for k, v in query.arrayset_data_records('writtenaset')]
+    assert items == expected
+    assert {name for _, name, _ in items} == {'foo', 7}
@@ -0,0 +1,190 @@
+import pytest
+import time
+import threading
+from os.path import join as pjoin
+from os import mkdir
+from random import randint
+
+
+@pytest.fixture()
+def limited_server_config(managed_tmpdir):
+    """returns a function writing a server config with the given grpc thread
+    pool size and rpc limits."""
+    import os
+    from hangar import constants as c
+    from hangar.remote import server
+
+    src_path = pjoin(os.path.dirname(server.__file__), 'config_server.yml')
+    base_tmpdir = pjoin(managed_tmpdir, 'limited_server')
+    mkdir(base_tmpdir)
+    mkdir(pjoin(base_tmpdir, c.DIR_HANGAR_SERVER))
+
+    def write_config(max_executing_rpcs, max_thread_pool_workers=2, max_concurrent_rpcs=50):
+        with open(src_path) as f:
+            lines = f.readlines()
+        for idx, line in enumerate(lines):
+            if line.lstrip().startswith('max_thread_pool_workers:'):
+                lines[idx] = f'    max_thread_pool_workers: {max_thread_pool_workers}\n'
+            elif line.lstrip().startswith('max_concurrent_rpcs:'):
+                lines[idx] = f'    max_concurrent_rpcs: {max_concurrent_rpcs}\n'
+            elif line.lstrip().startswith('max_executing_rpcs:'):
+                lines[idx] = f'    max_executing_rpcs: {max_executing_rpcs}\n'
+        dest = pjoin(base_tmpdir, c.DIR_HANGAR_SERVER, 'config_server.yml')
+        with open(dest, 'w') as f:
+            f.writelines(lines)
+        return base_tmpdir
+
+    return write_config
+
+
+def test_admission_counting_thread_pool_counts_queued_work():
+    from hangar.remote.concurrency_limit_interceptor import AdmissionCountingThreadPool
+
+    release = threading.Event()
+    pool = AdmissionCountingThreadPool(max_workers=1)
+    try:
+        assert pool.admitted == 0
+        running = pool.submit(release.wait)
+        queued = pool.submit(release.wait)
+        assert pool.admitted == 2
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert pool.admitted == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_concurrency_limit_counts_queued_calls_beyond_pool_size():
+    import grpc
+    from hangar.remote.concurrency_limit_interceptor import (
+        AdmissionCountingThreadPool, ConcurrencyLimitInterceptor)
+
+    class CallDetails:
+        method = '/hangar.HangarService/PING'
+        invocation_metadata = ()
+
+    release = threading.Event()
+    pool = AdmissionCountingThreadPool(max_workers=1)
+    interc = ConcurrencyLimitInterceptor(2, pool)
+    sentinel = object()
+    try:
+        assert interc.intercept_service(lambda details: sentinel, CallDetails) is sentinel
+        pool.submit(release.wait)
+        assert interc.intercept_service(lambda details: sentinel, CallDetails) is sentinel
+        pool.submit(release.wait)
+        assert interc.in_flight == 2
+
+        handler = interc.intercept_service(lambda details: sentinel, CallDetails)
+        assert handler is not sentinel
+        assert isinstance(handler, grpc.RpcMethodHandler)
+    finally:
+        release.set()
+        pool.shutdown()
+    assert interc.in_flight == 0
+
+
+def test_concurrency_limit_must_be_positive():
+    from hangar.remote.concurrency_limit_interceptor import (
+        AdmissionCountingThreadPool, ConcurrencyLimitInterceptor)
+
+    pool = AdmissionCountingThreadPool(max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            ConcurrencyLimitInterceptor(0, pool)
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize('method,request_streaming,response_streaming', [
+    ['PING', False, False],
+    ['FetchCommit', False, True],
+    ['PushCommit', True, False],
+    ['PushData', True, False],
+    ['FetchData', True, True],
+])
+def test_rpc_terminator_matches_method_call_shape(method, request_streaming, response_streaming):
+    import grpc
+    from hangar.remote.request_header_validator_interceptor import _select_rpc_terminator
+
+    handler = _select_rpc_terminator(method)(grpc.StatusCode.UNAVAILABLE, 'details')
+    assert handler.request_streaming is request_streaming
+    assert handler.response_streaming is response_streaming
+
+
+def test_push_restricted_server_terminates_stream_unary_push(server_instance_push_restricted):
+    import grpc
+    from hangar.remote import hangar_service_pb2, hangar_service_pb2_grpc
+
+    with grpc.insecure_channel(server_instance_push_restricted) as channel:
+        stub = hangar_service_pb2_grpc.HangarServiceStub(channel)
+        request = hangar_service_pb2.PushCommitRequest()
+        with pytest.raises(grpc.RpcError) as exc_info:
+            stub.PushCommit(iter([request]))
+        assert exc_info.value.code() == grpc.StatusCode.PERMISSION_DENIED
+
+
+def test_server_sheds_calls_over_max_executing_rpcs(limited_server_config):
+    import grpc
+    from hangar import serve
+    from hangar.remote import hangar_service_pb2, hangar_service_pb2_grpc
+
+    # one of two grpc threads may run calls, the other is left for rejections.
+    base_tmpdir = limited_server_config(max_executing_rpcs=1, max_thread_pool_workers=2)
+    address = f'localhost:{randint(50000, 59999)}'
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+
+    release = threading.Event()
+
+    def blocked_requests():
+        release.wait()
+        return
+        yield
+
+    try:
+        with grpc.insecure_channel(address) as channel:
+            stub = hangar_service_pb2_grpc.HangarServiceStub(channel)
+            # admitted, and holds its thread until its request stream ends.
+            busy = stub.FetchData(blocked_requests())
+            busy_thread = threading.Thread(target=lambda: list(busy))
+            busy_thread.start()
+            time.sleep(0.3)
+
+            with pytest.raises(grpc.RpcError) as exc_info:
+                stub.PING(hangar_service_pb2.PingRequest(), timeout=5)
+            assert exc_info.value.code() == grpc.StatusCode.UNAVAILABLE
+
+            release.set()
+            busy_thread.join(timeout=5)
+            assert stub.PING(hangar_service_pb2.PingRequest(), timeout=5).result == 'PONG'
+    finally:
+        release.set()
+        hangserver.env._close_environments()
+        server.stop(0.1)
+        time.sleep(0.2)
+
+
+@pytest.mark.parametrize('limits,match', [
+    [dict(max_executing_rpcs=2, max_thread_pool_workers=2), 'thread pool size'],
+    [dict(max_executing_rpcs=10, max_thread_pool_workers=20, max_concurrent_rpcs=10),
+     'max_concurrent_rpcs'],
+])
+def test_max_executing_rpcs_must_be_below_server_limits(limited_server_config, limits, match):
+    from hangar import serve
+
+    base_tmpdir = limited_server_config(**limits)
+    address = f'localhost:{randint(50000, 59999)}'
+    with pytest.raises(ValueError, match=match):
+        serve(base_tmpdir, overwrite=True, channel_address=address)
+
+
+def test_max_executing_rpcs_checked_against_env_thread_limit(monkeypatch, limited_server_config):
+    from hangar import serve
+
+    base_tmpdir = limited_server_config(max_executing_rpcs=4, max_thread_pool_workers=8)
+    monkeypatch.setenv('HANGAR_GRPC_MAX_THREADS', '4')
+    address = f'localhost:{randint(50000, 59999)}'
+    with pytest.raises(ValueError, match=r'thread pool size \(4\)'):
+        serve(base_tmpdir, overwrite=True, channel_address=address)
@@ -524,6 +524,20 @@ def test_fetch_branch_on_client_which_does_not_existserver_raises_rpc_error(writ
     assert exc_info.value._state.code == grpc.StatusCode.NOT_FOUND
 
 
+def test_fetch_commit_which_does_not_exist_on_server_raises_rpc_error(written_two_cmt_server_repo):
+    import grpc
+    from hangar.remote.client import HangarClient
+
+    address, repo = written_two_cmt_server_repo
+    client = HangarClient(envs=repo._env, address=address)
+    try:
+        with pytest.raises(grpc.RpcError) as exc_info:
+            client.fetch_commit_record('not-a-commit')
+        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    finally:
+        client.close()
+
+
 def test_push_clone_three_way_merge(server_instance, repo_2_br_no_conf, managed_tmpdir):
     from hangar import Repository
 
@@ -690,3 +704,375 @@ def test_push_restricted_wrong_user_and_password(server_instance_push_restricted
                                  'master',
                                  username='wrong_username',
                                  password='wrong_password')
+
+
+def test_server_refuses_records_to_client_without_record_format(written_two_cmt_server_repo):
+    import grpc
+    from hangar.remote import hangar_service_pb2, hangar_service_pb2_grpc
+
+    address, repo = written_two_cmt_server_repo
+    head = repo.log(return_contents=True)['head']
+    with grpc.insecure_channel(address) as channel:
+        stub = hangar_service_pb2_grpc.HangarServiceStub(channel)
+        request = hangar_service_pb2.FetchCommitRequest(commit=head)
+        with pytest.raises(grpc.RpcError) as exc_info:
+            list(stub.FetchCommit(request))
+        assert exc_info.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+
+        schema_rec = hangar_service_pb2.SchemaRecord(digest='abc')
+        request = hangar_service_pb2.FetchSchemaRequest(rec=schema_rec)
+        with pytest.raises(grpc.RpcError) as exc_info:
+            stub.FetchSchema(request)
+        assert exc_info.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+
+
+def test_unmarked_server_repo_serves_client_without_record_format(
+        server_instance_and_hangserver, written_two_cmt_repo):
+    import grpc
+    from hangar.context import TxnRegister
+    from hangar.records.parsing import repo_record_format_db_key
+    from hangar.remote import hangar_service_pb2, hangar_service_pb2_grpc
+
+    address, hangserver = server_instance_and_hangserver
+    written_two_cmt_repo.remote.add('origin', address)
+    assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+    # a server repository holding only legacy records has no format marker.
+    branchTxn = TxnRegister().begin_writer_txn(hangserver.env.branchenv)
+    try:
+        assert branchTxn.delete(repo_record_format_db_key())
+    finally:
+        TxnRegister().commit_writer_txn(hangserver.env.branchenv)
+
+    head = written_two_cmt_repo.log(return_contents=True)['head']
+    with grpc.insecure_channel(address) as channel:
+        stub = hangar_service_pb2_grpc.HangarServiceStub(channel)
+        request = hangar_service_pb2.FetchCommitRequest(commit=head)
+        replies = list(stub.FetchCommit(request))
+        assert replies[0].commit == head
+
+        request = hangar_service_pb2.FindMissingSchemasRequest(commit=head)
+        schema_digest = stub.FetchFindMissingSchemas(request).schema_digests[0]
+        schema_rec = hangar_service_pb2.SchemaRecord(digest=schema_digest)
+        request = hangar_service_pb2.FetchSchemaRequest(rec=schema_rec)
+        assert stub.FetchSchema(request).rec.digest == schema_digest
+
+
+def test_client_refuses_to_push_records_to_older_server(server_instance, written_two_cmt_repo):
+    from hangar.records.parsing import repo_version_raw_string_from_raw_spec
+    from hangar.records.vcompat import current_record_format
+    from hangar.remote.client import HangarClient
+
+    client = HangarClient(envs=written_two_cmt_repo._env, address=server_instance)
+    try:
+        assert client.cfg['record_format'] == repo_version_raw_string_from_raw_spec(
+            current_record_format)
+        client.cfg['record_format'] = '0.3.0'
+        with pytest.raises(RuntimeError, match='upgrade the server'):
+            client.push_commit_record('abc', b'', b'', b'')
+        with pytest.raises(RuntimeError, match='upgrade the server'):
+            client.push_schema('abc', b'')
+    finally:
+        client.close()
+
+
+def test_bulk_transfer_rejected_while_all_slots_busy(monkeypatch, managed_tmpdir, written_two_cmt_repo):
+    import grpc
+    import hangar.remotes
+    from hangar import serve
+    from hangar.remote.client import HangarClient
+
+    # two grpc threads leave room for a single bulk transfer at a time.
+    monkeypatch.setenv('HANGAR_GRPC_MAX_THREADS', '2')
+    address = f'localhost:{randint(50000, 59999)}'
+    base_tmpdir = pjoin(managed_tmpdir, 'bulk_slots')
+    mkdir(base_tmpdir)
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+    try:
+        written_two_cmt_repo.remote.add('origin', address)
+        assert hangserver._bulk_slots.acquire(blocking=False)
+        assert not hangserver._bulk_slots.acquire(blocking=False)
+        try:
+            assert written_two_cmt_repo.remote.ping('origin') > 0
+            # commit and find-missing rpcs are short and never take a slot.
+            cmts = written_two_cmt_repo.log(return_contents=True)['order']
+            client = HangarClient(envs=written_two_cmt_repo._env, address=address)
+            try:
+                reply = client.push_find_missing_commits('master')
+                assert sorted(reply.commits) == sorted(cmts)
+                assert len(client.push_find_missing_hash_records(cmts[0])) > 0
+            finally:
+                client.close()
+            monkeypatch.setattr(hangar.remotes, '_BUSY_RETRY_ATTEMPTS', 2)
+            monkeypatch.setattr(hangar.remotes, '_BUSY_RETRY_DELAY', 0.01)
+            with pytest.raises(grpc.RpcError) as exc_info:
+                written_two_cmt_repo.remote.push('origin', 'master')
+            assert exc_info.value.code() == grpc.StatusCode.UNAVAILABLE
+        finally:
+            hangserver._bulk_slots.release()
+
+        assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+    finally:
+        hangserver.env._close_environments()
+        server.stop(0.1)
+        time.sleep(0.2)
+
+
+def test_push_and_fetch_data_retry_until_bulk_slot_frees(monkeypatch, managed_tmpdir, written_two_cmt_repo):
+    import threading
+    import hangar.remotes
+    from hangar import Repository, serve
+
+    monkeypatch.setenv('HANGAR_GRPC_MAX_THREADS', '2')
+    monkeypatch.setattr(hangar.remotes, '_BUSY_RETRY_DELAY', 0.05)
+    address = f'localhost:{randint(50000, 59999)}'
+    base_tmpdir = pjoin(managed_tmpdir, 'bulk_retry')
+    mkdir(base_tmpdir)
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+    try:
+        written_two_cmt_repo.remote.add('origin', address)
+        assert hangserver._bulk_slots.acquire(blocking=False)
+        threading.Timer(0.2, hangserver._bulk_slots.release).start()
+        assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+
+        new_tmpdir = pjoin(managed_tmpdir, 'new')
+        mkdir(new_tmpdir)
+        newRepo = Repository(path=new_tmpdir, exists=False)
+        newRepo.clone('Test User', 'tester@foo.com', 'test repo', address, remove_old=True)
+        cmt = newRepo.log(return_contents=True)['head']
+        assert hangserver._bulk_slots.acquire(blocking=False)
+        threading.Timer(0.2, hangserver._bulk_slots.release).start()
+        assert newRepo.remote.fetch_data('origin', commit=cmt) == [cmt]
+
+        co = written_two_cmt_repo.checkout()
+        nco = newRepo.checkout(commit=cmt)
+        aset, naset = co.arraysets['writtenaset'], nco.arraysets['writtenaset']
+        assert len(naset) == len(aset)
+        for sName in aset.keys():
+            assert np.allclose(naset[sName], aset[sName])
+        co.close()
+        nco.close()
+        newRepo._env._close_environments()
+    finally:
+        hangserver.env._close_environments()
+        server.stop(0.1)
+        time.sleep(0.2)
+
+
+def test_fetch_data_reuses_thread_scratch_across_reply_sizes(monkeypatch, managed_tmpdir, repo):
+    from hangar import Repository, serve
+
+    # a single grpc thread packs every reply into the same scratch buffer.
+    monkeypatch.setenv('HANGAR_GRPC_MAX_THREADS', '1')
+    address = f'localhost:{randint(50000, 59999)}'
+    base_tmpdir = pjoin(managed_tmpdir, 'scratch_server')
+    mkdir(base_tmpdir)
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+    try:
+        cmtList = []
+        for shape, nsamples in [((300, 300), 5), ((4, 4), 3), ((200, 200), 4)]:
+            co = repo.checkout(write=True)
+            name = f'aset_{shape[0]}'
+            co.arraysets.init_arrayset(name=name, shape=shape, dtype=np.float64)
+            sampList = [np.random.randn(*shape) for _ in range(nsamples)]
+            with co.arraysets[name] as d:
+                for sIdx, arr in enumerate(sampList):
+                    d[str(sIdx)] = arr
+            cmtList.append((co.commit(f'add {name}'), name, sampList))
+            co.close()
+        repo.remote.add('origin', address)
+        assert repo.remote.push('origin', 'master') == 'master'
+
+        new_tmpdir = pjoin(managed_tmpdir, 'new')
+        mkdir(new_tmpdir)
+        newRepo = Repository(path=new_tmpdir, exists=False)
+        newRepo.clone('Test User', 'tester@foo.com', 'test repo', address, remove_old=True)
+        for cmt, name, sampList in cmtList:
+            newRepo.remote.fetch_data('origin', commit=cmt, arrayset_names=[name])
+            nco = newRepo.checkout(commit=cmt)
+            for sIdx, samp in enumerate(sampList):
+                assert np.allclose(nco.arraysets[name][str(sIdx)], samp)
+            nco.close()
+        newRepo._env._close_environments()
+    finally:
+        hangserver.env._close_environments()
+        server.stop(0.1)
+        time.sleep(0.2)
+
+
+def test_clone_fetches_label_larger_than_grpc_default_message_limit(monkeypatch, managed_tmpdir):
+    import random
+    import string
+    from hangar import Repository, serve
+    from hangar import constants as c
+
+    # room in the server and both repos for a label bigger than 4MB.
+    monkeypatch.setitem(c.LMDB_SETTINGS, 'map_size', 100_000_000)
+    address = f'localhost:{randint(50000, 59999)}'
+    base_tmpdir = pjoin(managed_tmpdir, 'big_label_server')
+    mkdir(base_tmpdir)
+    server, hangserver, _ = serve(base_tmpdir, overwrite=True, channel_address=address)
+    server.start()
+    try:
+        repo_tmpdir = pjoin(managed_tmpdir, 'origin')
+        mkdir(repo_tmpdir)
+        repo = Repository(path=repo_tmpdir, exists=False)
+        repo.init(user_name='tester', user_email='foo@test.bar', repo_desc='test repo', remove_old=True)
+        # random text barely compresses, so the label reply exceeds grpc's 4MB default.
+        rng = random.Random(0)
+        bigLabel = ''.join(rng.choice(string.ascii_letters) for _ in range(8_000_000))
+        co = repo.checkout(write=True)
+        co.metadata['big'] = bigLabel
+        co.commit('add big label')
+        co.close()
+        repo.remote.add('origin', address)
+        assert repo.remote.push('origin', 'master') == 'master'
+        repo._env._close_environments()
+
+        new_tmpdir = pjoin(managed_tmpdir, 'new')
+        mkdir(new_tmpdir)
+        newRepo = Repository(path=new_tmpdir, exists=False)
+        newRepo.clone('Test User', 'tester@foo.com', 'test repo', address, remove_old=True)
+        nco = newRepo.checkout()
+        assert nco.metadata['big'] == bigLabel
+        nco.close()
+        newRepo._env._close_environments()
+    finally:
+        hangserver.env._close_environments()
+        server.stop(0.1)
+        time.sleep(0.2)
+
+
+def _expected_commit_data_hashes(repo, commit):
+    import lmdb
+    import tempfile
+    from hangar import constants as c
+    from hangar.records import commiting, queries
+
+    with tempfile.TemporaryDirectory() as tempD:
+        tmpDB = lmdb.open(path=pjoin(tempD, 'expected.lmdb'), **c.LMDB_TMP_SETTINGS)
+        try:
+            commiting.unpack_commit_ref(repo._env.refenv, tmpDB, commit)
+            return queries.RecordQuery(tmpDB).data_hash_to_schema_hash()
+        finally:
+            tmpDB.close()
+
+
+def test_cached_commit_queries_survive_scratch_env_reuse(server_instance_and_hangserver,
+                                                         written_two_cmt_repo):
+    address, hangserver = server_instance_and_hangserver
+    written_two_cmt_repo.remote.add('origin', address)
+    assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+    cmts = written_two_cmt_repo.log(return_contents=True)['order']
+    expected = {cmt: _expected_commit_data_hashes(written_two_cmt_repo, cmt) for cmt in cmts}
+    assert expected[cmts[0]] != expected[cmts[1]]
+
+    first = hangserver._commit_queries(cmts[0])
+    # unpacking another commit drops and refills the scratch db.
+    second = hangserver._commit_queries(cmts[1])
+    hangserver._load_commit_queries(cmts[1])
+
+    assert hangserver._commit_queries(cmts[0]) is first
+    assert dict(first.data_hash_to_schema_hash) == expected[cmts[0]]
+    assert dict(second.data_hash_to_schema_hash) == expected[cmts[1]]
+    for queryRes in (first, second):
+        for digest, schema_hash in queryRes.data_hash_to_schema_hash.items():
+            assert type(digest) is str and type(schema_hash) is str
+        assert all(type(digest) is str for digest in queryRes.schema_hashes)
+
+
+def test_concurrent_find_missing_on_different_commits(server_instance_and_hangserver,
+                                                      written_two_cmt_repo, managed_tmpdir):
+    from concurrent.futures import ThreadPoolExecutor
+    from hangar import Repository
+    from hangar.remote.client import HangarClient
+
+    address, hangserver = server_instance_and_hangserver
+    written_two_cmt_repo.remote.add('origin', address)
+    assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+    cmts = written_two_cmt_repo.log(return_contents=True)['order']
+    expected = {cmt: _expected_commit_data_hashes(written_two_cmt_repo, cmt) for cmt in cmts}
+
+    # a client holding no data is missing every record of each commit.
+    new_tmpdir = pjoin(managed_tmpdir, 'empty')
+    mkdir(new_tmpdir)
+    emptyRepo = Repository(path=new_tmpdir, exists=False)
+    emptyRepo.init(user_name='tester', user_email='foo@test.bar', repo_desc='test repo', remove_old=True)
+    client = HangarClient(envs=emptyRepo._env, address=address)
+    try:
+        requested = [cmts[idx % 2] for idx in range(24)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(client.fetch_find_missing_hash_records, requested))
+            # the second round is served from the commit query cache.
+            results += list(pool.map(client.fetch_find_missing_hash_records, requested))
+        for cmt, missing in zip(requested * 2, results):
+            assert dict(missing) == expected[cmt]
+    finally:
+        client.close()
+        emptyRepo._env._close_environments()
+
+
+@pytest.mark.parametrize('enabled_algorithms', [
+    # identity only: the client accepts no compressed replies at all.
+    1,
+    # identity and deflate, but not the gzip some handlers pick.
+    (1 << 0) | (1 << 1),
+])
+def test_client_with_compression_disabled_reads_per_rpc_compressed_replies(
+        written_two_cmt_server_repo, enabled_algorithms):
+    import grpc
+    from hangar import constants as c
+    from hangar.records.parsing import repo_version_raw_string_from_raw_spec
+    from hangar.records.vcompat import current_record_format
+    from hangar.remote import hangar_service_pb2, hangar_service_pb2_grpc
+
+    address, repo = written_two_cmt_server_repo
+    cmts = repo.log(return_contents=True)['order']
+    options = [('grpc.default_compression_algorithm', grpc.Compression.NoCompression.value),
+               ('grpc.compression_enabled_algorithms_bitset', enabled_algorithms)]
+    metadata = ((c.HEADER_CLIENT_RECORD_FORMAT,
+                 repo_version_raw_string_from_raw_spec(current_record_format)),)
+    with grpc.insecure_channel(address, options=options) as channel:
+        stub = hangar_service_pb2_grpc.HangarServiceStub(channel)
+
+        # gzip selected by the server for these two handlers.
+        request = hangar_service_pb2.FindMissingCommitsRequest(
+            branch=hangar_service_pb2.BranchRecord(name='master'))
+        reply = stub.FetchFindMissingCommits(request, metadata=metadata)
+        assert sorted(reply.commits) == sorted(cmts)
+        request = hangar_service_pb2.FindMissingSchemasRequest(commit=cmts[0])
+        reply = stub.FetchFindMissingSchemas(request, metadata=metadata)
+        assert len(reply.schema_digests) == 1
+
+        # compression disabled by the server for this handler.
+        request = hangar_service_pb2.FetchCommitRequest(commit=cmts[0])
+        replies = list(stub.FetchCommit(request, metadata=metadata))
+        assert replies[0].commit == cmts[0]
+
+
+@pytest.mark.parametrize('client_compression', [False, True])
+def test_push_clone_fetch_with_client_compression_setting(
+        monkeypatch, server_instance, written_two_cmt_repo, managed_tmpdir, client_compression):
+    from hangar import Repository
+    from hangar.remote import config
+
+    monkeypatch.setitem(config.config['client']['grpc'], 'enable_compression', client_compression)
+    written_two_cmt_repo.remote.add('origin', server_instance)
+    assert written_two_cmt_repo.remote.push('origin', 'master') == 'master'
+
+    new_tmpdir = pjoin(managed_tmpdir, 'new')
+    mkdir(new_tmpdir)
+    newRepo = Repository(path=new_tmpdir, exists=False)
+    newRepo.clone('Test User', 'tester@foo.com', 'test repo', server_instance, remove_old=True)
+    for cmt in written_two_cmt_repo.log(return_contents=True)['order']:
+        newRepo.remote.fetch_data('origin', commit=cmt)
+        co = written_two_cmt_repo.checkout(commit=cmt)
+        nco = newRepo.checkout(commit=cmt)
+        assert list(nco.arraysets['writtenaset'].keys()) == list(co.arraysets['writtenaset'].keys())
+        for key, arr in co.arraysets['writtenaset'].items():
+            assert np.allclose(nco.arraysets['writtenaset'][key], arr)
+        nco.close()
+        co.close()
+    newRepo._env._close_environments()